@@ -16,4 +16,72 @@ CREATE TABLE IF NOT EXISTS users (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     username TEXT UNIQUE NOT NULL,
     hashed_password TEXT NOT NULL
-);
\ No newline at end of file
+);
+
+CREATE TABLE IF NOT EXISTS book_similarities (
+    book_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    similar_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (book_id, rank)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS book_changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version INTEGER NOT NULL,
+    book_id INTEGER NOT NULL,
+    operation TEXT NOT NULL CHECK (operation IN ('insert', 'update', 'delete')),
+    changed_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_book_changes_version ON book_changes (version);
+-- Stats aggregates. The triggers keeping them in sync with books are created
+-- by utils/aggregates.py, which also fills the tables for an existing catalog.
+CREATE TABLE IF NOT EXISTS category_stats (
+    category TEXT PRIMARY KEY NOT NULL,
+    count INTEGER NOT NULL,
+    price_count INTEGER NOT NULL,
+    price_sum REAL NOT NULL,
+    price_sumsq REAL NOT NULL,
+    min_price REAL,
+    max_price REAL
+);
+
+CREATE TABLE IF NOT EXISTS rating_stats (
+    rating INTEGER NOT NULL PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_books_category_price ON books (category, price);
+
+-- Uniform book sample for approximate stats, maintained by triggers created
+-- in utils/aggregates.py.
+CREATE TABLE IF NOT EXISTS book_sample (
+    book_id INTEGER PRIMARY KEY,
+    priority REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_book_sample_priority ON book_sample (priority);
+
+CREATE TABLE IF NOT EXISTS sample_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    size INTEGER NOT NULL,
+    threshold REAL NOT NULL,
+    sampled INTEGER NOT NULL,
+    population INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS book_price_history (
+    book_url TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    price REAL,
+    availability TEXT,
+    rating INTEGER,
+    recorded_at TEXT,
+    PRIMARY KEY (book_url, version)
+) WITHOUT ROWID;
@@ -1,7 +1,45 @@
 from .routes import auth, books, categories, health, stats, home, logs, ml
+from src.api.middleware.compression_middleware import CompressionMiddleware
+from src.api.middleware.response_cache_middleware import ResponseCacheMiddleware
 from src.api.middleware.logging_middleware import LoggingMiddleware
+from src.api.utils.cache import report_cache_stats
+from src.api.services.prewarm_service import prewarm_on_catalog_change
+from src.api.services.book_service import ensure_similarity_index
+from src.api.utils.warmup import load_manifest, run_warmup
+from src.api.config import (
+    CACHE_STATS_LOG_INTERVAL,
+    PREWARM_POLL_INTERVAL,
+    RESPONSE_CACHE_ENABLED,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+import asyncio
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the caches and start background tasks when the app starts, and
+    cancel the tasks on shutdown. The app only accepts requests once the
+    similarity index is built (if the scraper has not built it) and the
+    warm-up manifest has run (see CACHE_WARMUP_MANIFEST); its per-entry
+    timings are kept in ``app.state.cache_warmup``.
+    Cache metrics are logged every CACHE_STATS_LOG_INTERVAL seconds and the
+    catalog version is checked every PREWARM_POLL_INTERVAL seconds to pre-warm
+    the caches with the hottest logged queries (0 disables either task).
+    """
+    await asyncio.to_thread(ensure_similarity_index)
+    app.state.cache_warmup = await asyncio.to_thread(run_warmup, load_manifest())
+    tasks = []
+    if CACHE_STATS_LOG_INTERVAL > 0:
+        tasks.append(asyncio.create_task(report_cache_stats(CACHE_STATS_LOG_INTERVAL)))
+    if PREWARM_POLL_INTERVAL > 0:
+        tasks.append(asyncio.create_task(prewarm_on_catalog_change(PREWARM_POLL_INTERVAL)))
+    yield
+    for task in tasks:
+        task.cancel()
+
 
 app = FastAPI(
     title="BookOnTheTable API",
@@ -18,6 +56,7 @@ app = FastAPI(
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT",
     },
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -28,6 +67,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
+if RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware)
+
 app.add_middleware(LoggingMiddleware)
 
 app.include_router(home.router)
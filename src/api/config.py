@@ -5,3 +5,74 @@ SECRET_KEY = "your_secret_key_here"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+CACHE_SAFETY_TTL = int(os.getenv("CACHE_SAFETY_TTL", 24 * 60 * 60))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+# On-disk caches must live in a directory private to the API user; shared
+# locations such as /tmp are refused (see ensure_private_path).
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "~/.cache/bookonthetable/cache.db")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+# Persistent on-disk L2 tier behind the in-memory caches listed in
+# CACHE_L2_CACHES (comma separated), surviving restarts. Disabled by default;
+# stats_cache is the one worth tiering, as its aggregates cost more to compute
+# than to decode. Caches holding book ID lists or whole rows gain nothing,
+# since the record store still reads every book on a cold start.
+CACHE_L2_PATH = os.getenv("CACHE_L2_PATH", "~/.cache/bookonthetable/l2.db")
+CACHE_L2_CACHES = [
+    name.strip()
+    for name in os.getenv("CACHE_L2_CACHES", "").split(",")
+    if name.strip()
+]
+# Estimated bytes all in-memory caches of a process may hold together.
+CACHE_MEMORY_BUDGET_MB = float(os.getenv("CACHE_MEMORY_BUDGET_MB", 256))
+CACHE_STATS_LOG_INTERVAL = float(os.getenv("CACHE_STATS_LOG_INTERVAL", 300))
+CACHE_SINGLE_FLIGHT_TIMEOUT = float(os.getenv("CACHE_SINGLE_FLIGHT_TIMEOUT", 30))
+
+# Threads recomputing stale-while-revalidate entries (stats and ML features
+# caches) in the background while the previous value is served.
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", 2))
+
+# Service calls run at startup to fill the caches before the app serves
+# requests. Each entry is "module:function" plus the positional arguments the
+# routes use, so the warmed keys match real requests. CACHE_WARMUP_MANIFEST may
+# point to a JSON file with the same structure to replace the default list.
+CACHE_WARMUP_MANIFEST = [
+    {"call": "src.api.services.book_service:get_all_books"},
+    {"call": "src.api.services.stats_service:get_category_stats"},
+    {"call": "src.api.services.ml_service:extract_features"},
+    {"call": "src.api.services.book_service:get_top_rated_books", "args": [10]},
+]
+CACHE_WARMUP_MANIFEST_PATH = os.getenv("CACHE_WARMUP_MANIFEST")
+CACHE_WARMUP_CONCURRENCY = int(os.getenv("CACHE_WARMUP_CONCURRENCY", 4))
+CACHE_WARMUP_TIMEOUT = float(os.getenv("CACHE_WARMUP_TIMEOUT", 60))
+
+# Log-driven pre-warming: after every catalog change, replay the PREWARM_TOP_N
+# most frequent searches, price ranges and top-rated queries of the last
+# PREWARM_WINDOW_DAYS days. The catalog version is checked every
+# PREWARM_POLL_INTERVAL seconds (0 disables the job).
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", 50))
+PREWARM_WINDOW_DAYS = float(os.getenv("PREWARM_WINDOW_DAYS", 7))
+PREWARM_POLL_INTERVAL = float(os.getenv("PREWARM_POLL_INTERVAL", 30))
+
+# HTTP response cache for idempotent catalog GETs, keyed by path, query,
+# negotiated representation and catalog version.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+RESPONSE_CACHE_PATHS = (
+    "/api/v1/books",
+    "/api/v1/categories",
+    "/api/v1/stats",
+    "/api/v1/ml/features",
+    "/api/v1/ml/training-data",
+)
+RESPONSE_CACHE_EXCLUDED_PATHS = ("/api/v1/books/export",)
+RESPONSE_CACHE_MAX_BODY = int(os.getenv("RESPONSE_CACHE_MAX_BODY", 8 * 1024 * 1024))
+
+# Size of the uniform sample of books maintained at ingest, answering the
+# approx=true variants of the /api/v1/stats endpoints.
+STATS_SAMPLE_SIZE = int(os.getenv("STATS_SAMPLE_SIZE", 10_000))
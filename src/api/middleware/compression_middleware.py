@@ -0,0 +1,166 @@
+from src.api.utils.cache import compressed_responses_cache
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.api.config import (
+    COMPRESSION_MINIMUM_SIZE,
+    GZIP_LEVEL,
+    BROTLI_QUALITY,
+    ZSTD_LEVEL,
+)
+from hashlib import blake2b
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/vnd.apache.arrow.stream",
+    "text/",
+)
+
+
+def _gzip(body: bytes) -> bytes:
+    """Compress a body with gzip."""
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    """Compress a body with brotli."""
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+
+def _zstd(body: bytes) -> bytes:
+    """Compress a body with zstd."""
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+
+
+ENCODERS = {"gzip": _gzip}
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+
+PREFERENCE = ("zstd", "br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """
+    Pick the best supported content coding for an Accept-Encoding header.
+    Codings with a higher q-value win; ties are broken by server preference.
+    Args:
+        accept_encoding (str): The raw Accept-Encoding header value.
+    Returns:
+        str: The chosen coding, or None if the response should not be compressed.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(coding, wildcard), -rank, coding)
+        for rank, coding in enumerate(PREFERENCE)
+        if coding in ENCODERS
+    ]
+    quality, _, coding = max(candidates)
+    return coding if quality > 0 else None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body, reusing a previously compressed copy of an
+    identical payload when one is cached for the same encoding.
+    Args:
+        body (bytes): The uncompressed response body.
+        encoding (str): The content coding to apply.
+    Returns:
+        bytes: The compressed body.
+    """
+    key = (encoding, blake2b(body, digest_size=16).digest())
+    try:
+        compressed = compressed_responses_cache.get(key)
+        compressed_responses_cache.record_hit()
+    except KeyError:
+        compressed_responses_cache.record_miss()
+        compressed = ENCODERS[encoding](body)
+        compressed_responses_cache.set(key, compressed)
+    return compressed
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating gzip, brotli or zstd compression.
+    Responses smaller than the minimum size, already encoded, partial, streamed
+    in several chunks or of a non-compressible type are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body", False)
+                or start_message["status"] == 206
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,132 @@
+from src.api.utils.cache import http_responses_cache, current_catalog_version
+from src.api.middleware.compression_middleware import negotiate_encoding
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.api.utils.jwt_handler import decode_token
+from urllib.parse import parse_qsl
+from src.api.config import (
+    RESPONSE_CACHE_PATHS,
+    RESPONSE_CACHE_EXCLUDED_PATHS,
+    RESPONSE_CACHE_MAX_BODY,
+)
+
+
+def is_authenticated(headers: Headers) -> bool:
+    """
+    Check the bearer token of a request the way ``get_current_user`` does.
+    Args:
+        headers (Headers): The request headers.
+    Returns:
+        bool: True if the request carries a valid access token.
+    """
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = decode_token(token)
+    return payload is not None and payload.get("type") == "access" and "sub" in payload
+
+
+def response_cache_key(scope: Scope, headers: Headers) -> tuple:
+    """
+    Build the cache key of a request: catalog version, path, query parameters
+    in canonical order and everything that selects the representation
+    (Accept, negotiated content coding and Origin for CORS headers).
+    Args:
+        scope (Scope): The ASGI request scope.
+        headers (Headers): The request headers.
+    Returns:
+        tuple: The hashable cache key.
+    """
+    query = tuple(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+    return (
+        current_catalog_version(),
+        scope["path"],
+        query,
+        headers.get("accept", "").replace(" ", ""),
+        negotiate_encoding(headers.get("accept-encoding", "")),
+        headers.get("origin"),
+    )
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware caching complete responses of idempotent catalog GETs.
+    Hits skip routing, services, model validation, serialization and
+    compression, but still require a valid access token: requests without
+    one always reach the app, which rejects them. Only 200 responses of at
+    most RESPONSE_CACHE_MAX_BODY bytes are stored; entries are dropped when
+    the catalog version changes.
+    """
+
+    def __init__(self, app: ASGIApp, max_body: int = RESPONSE_CACHE_MAX_BODY):
+        self.app = app
+        self.max_body = max_body
+
+    @staticmethod
+    def is_cacheable(scope: Scope) -> bool:
+        path = scope["path"]
+        return (
+            scope["method"] == "GET"
+            and path.startswith(RESPONSE_CACHE_PATHS)
+            and not path.startswith(RESPONSE_CACHE_EXCLUDED_PATHS)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.is_cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if not is_authenticated(headers):
+            await self.app(scope, receive, send)
+            return
+
+        key = response_cache_key(scope, headers)
+        try:
+            status, response_headers, body = http_responses_cache.get(key)
+            http_responses_cache.record_hit()
+        except KeyError:
+            http_responses_cache.record_miss()
+        else:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": [*response_headers, (b"x-cache", b"HIT")],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start_message = None
+        chunks = []
+        size = 0
+        cacheable = True
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, size, cacheable
+            if message["type"] == "http.response.start":
+                start_message = message
+                response_headers = Headers(raw=message["headers"])
+                cacheable = (
+                    message["status"] == 200
+                    and "set-cookie" not in response_headers
+                    and "no-store" not in response_headers.get("cache-control", "")
+                )
+                message = {**message, "headers": [*message["headers"], (b"x-cache", b"MISS")]}
+            elif message["type"] == "http.response.body" and cacheable:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > self.max_body:
+                    cacheable = False
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+                    if not message.get("more_body", False):
+                        http_responses_cache.set(
+                            key,
+                            (start_message["status"], tuple(start_message["headers"]), b"".join(chunks)),
+                        )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
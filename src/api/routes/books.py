@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import FileResponse
+from src.api.utils.negotiation import negotiated_response
 from src.api.utils.jwt_handler import get_current_user
 from logging import getLogger, basicConfig, INFO
 from typing import Optional, List
@@ -9,14 +11,30 @@ from src.api.services.book_service import (
     search_books,
     get_top_rated_books,
     get_price_range_books,
+    get_similar_books,
+    get_book_history,
+    get_book_changes,
 )
+from src.api.services.export_service import (
+    EXPORT_FORMATS,
+    ExportUnavailable,
+    get_catalog_export,
+)
+from utils.similarity_index import TOP_K
 from src.api.schemas.books_schema import (
     Books,
     Search,
     TopRated,
     PriceRange,
     SearchById,
+    Similar,
+    Export,
+    Changes,
+    History,
     BookResponse,
+    ChangesResponse,
+    HistoryResponse,
+    SimilarBookResponse,
 )
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -27,10 +45,12 @@ logger = getLogger(__name__)
 basicConfig(level=INFO, format=FORMAT)
 
 @router.get("/", **Books.docs)
-def list_books(current_user: dict = Depends(get_current_user)) -> List[BookResponse]:
+def list_books(request: Request, current_user: dict = Depends(get_current_user)) -> List[BookResponse]:
     """
     Retrieve a list of all books in the database.
+    Also served as MessagePack or as an Arrow IPC stream when requested via Accept.
     Args:
+        request (Request): The incoming request, used for content negotiation.
         current_user (dict): The current authenticated user.
     Returns:
         list: A list of dictionaries, each representing a book.
@@ -39,6 +59,9 @@ def list_books(current_user: dict = Depends(get_current_user)) -> List[BookRespo
         books = get_all_books()
         if not books:
             raise HTTPException(status_code=404, detail="No matching books found")
+        encoded = negotiated_response(request, books, records=books)
+        if encoded is not None:
+            return encoded
         return [BookResponse(**book) for book in books]
     except Exception as e:
         logger.error(f"Books {books}, type: {type(books)}")
@@ -128,6 +151,66 @@ def get_books_by_price_range(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.get("/changes", **Changes.docs)
+def book_changes(
+        since: int = Query(
+            0, ge=0, description="Catalog version the client last synchronised to"
+        ),
+        current_user: dict = Depends(get_current_user),
+    ) -> ChangesResponse:
+    """
+    Retrieve the books inserted, updated and deleted since a catalog version.
+    Clients store the returned ``version`` and pass it as ``since`` on their
+    next call, so each sync only transfers the delta. When
+    ``resync_required`` is set, ``since`` predates the change log: the client
+    reloads the whole catalog and synchronises from ``version`` afterwards.
+    Args:
+        since (int): The catalog version the client last synchronised to.
+        current_user (dict): The current authenticated user.
+    Returns:
+        ChangesResponse: The changed books and the current catalog version.
+    """
+    changes = None
+    try:
+        changes = get_book_changes(since)
+        return ChangesResponse(**changes)
+    except Exception as e:
+        logger.error(f"Changes: {changes}, type: {type(changes)}")
+        logger.error(f"Error fetching book changes: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/export", **Export.docs)
+def export_books(
+        export_format: str = Query(
+            "parquet", alias="format", pattern="^(parquet|arrow|csv)$"
+        ),
+        current_user: dict = Depends(get_current_user),
+    ) -> FileResponse:
+    """
+    Download the whole books table as a single columnar or CSV file.
+    The file is generated once per catalog version and served from disk,
+    with Range support so interrupted downloads can be resumed.
+    Args:
+        export_format (str): One of "parquet", "arrow" or "csv".
+        current_user (dict): The current authenticated user.
+    Returns:
+        FileResponse: The export file.
+    Raises:
+        HTTPException: If the format is unavailable or the export fails.
+    """
+    try:
+        path = get_catalog_export(export_format)
+        return FileResponse(
+            path, media_type=EXPORT_FORMATS[export_format], filename=f"books.{export_format}"
+        )
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error exporting books as {export_format}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 @router.get("/{book_id}", **SearchById.docs)
 def book_id(
         book_id: int, current_user: dict = Depends(get_current_user)
@@ -151,4 +234,71 @@ def book_id(
     except Exception as e:
         logger.error(f"Book ID: {book_id}, Error: {e}")
         logger.error(f"Error fetching book by ID: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/{book_id}/similar", **Similar.docs)
+def similar_books(
+        book_id: int,
+        limit: int = Query(
+            10, gt=0, le=TOP_K, description="Maximum number of similar books to return"
+        ),
+        current_user: dict = Depends(get_current_user),
+    ) -> List[SimilarBookResponse]:
+    """
+    Retrieve the books most similar to a given book.
+    Neighbours are looked up in the precomputed similarity index, built from
+    the title, description, category and price of every book.
+    Args:
+        book_id (int): The ID of the reference book.
+        limit (int): The maximum number of similar books to return.
+        current_user (dict): The current authenticated user.
+    Returns:
+        list: A list of similar books with their similarity score.
+    Raises:
+        HTTPException: If the book is unknown or has no indexed neighbours.
+    """
+    books = None
+    try:
+        books = get_similar_books(book_id, limit)
+        if books is None:
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+        if not books:
+            raise HTTPException(status_code=404, detail="No similar books found")
+        return [SimilarBookResponse(**book) for book in books]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Similar Books: {books}, type: {type(books)}")
+        logger.error(f"Error fetching similar books: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@router.get("/{book_id}/history", **History.docs)
+def book_history(
+        book_id: int, current_user: dict = Depends(get_current_user)
+    ) -> HistoryResponse:
+    """
+    Retrieve how the price, availability and rating of a book changed across
+    scrapes. Only scrapes that changed one of those fields are listed.
+    Args:
+        book_id (int): The ID of the book.
+        current_user (dict): The current authenticated user.
+    Returns:
+        HistoryResponse: The history of the book, oldest first.
+    Raises:
+        HTTPException: If the book is unknown.
+    """
+    history = None
+    try:
+        history = get_book_history(book_id)
+        if history is None:
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+        if not history:
+            raise HTTPException(status_code=404, detail="Book not found")
+        return HistoryResponse(**history)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"History: {history}, type: {type(history)}")
+        logger.error(f"Error fetching book history: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
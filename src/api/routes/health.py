@@ -1,7 +1,12 @@
 from src.api.utils.jwt_handler import get_current_user
 from fastapi import APIRouter, Depends, HTTPException
-from src.api.services.health_service import check_health
-from src.api.schemas.health_schema import HealthResponse, Health
+from src.api.services.health_service import check_health, get_cache_stats
+from src.api.schemas.health_schema import (
+    HealthResponse,
+    Health,
+    CacheStatsResponse,
+    CacheHealth,
+)
 from logging import getLogger, basicConfig, INFO
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -25,3 +30,20 @@ def health(current_user: dict = Depends(get_current_user)) -> HealthResponse:
         logger.error(f"Health check failed: {e}")
         logger.error(f"Error during health check: {e}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+
+@router.get("/cache", **CacheHealth.docs)
+def cache(current_user: dict = Depends(get_current_user)) -> CacheStatsResponse:
+    """
+    Report hit, miss, eviction, expiry, fill latency and size metrics per cache.
+    Returns:
+        CacheStatsResponse: The metrics of every cache.
+    """
+    stats = None
+    try:
+        stats = get_cache_stats()
+        return CacheStatsResponse(**stats)
+    except Exception as e:
+        logger.error(f"Cache Stats: {stats}, type: {type(stats)}")
+        logger.error(f"Error fetching cache stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,5 +1,6 @@
 from src.api.services.ml_service import extract_features, get_training_data, predict
-from fastapi import APIRouter, Depends, Body, HTTPException
+from fastapi import APIRouter, Depends, Body, HTTPException, Request
+from src.api.utils.negotiation import negotiated_response
 from src.api.utils.jwt_handler import get_current_user
 from logging import getLogger, basicConfig, INFO
 from src.api.schemas.ml_schema import (
@@ -17,16 +18,21 @@ logger = getLogger(__name__)
 basicConfig(level=INFO, format=FORMAT)
 
 @router.get("/features", **Features.docs)
-def get_features(current_user: dict = Depends(get_current_user)) -> FeatureResponse:
+def get_features(request: Request, current_user: dict = Depends(get_current_user)) -> FeatureResponse:
     """
     Returns a list of ML-ready features extracted from books.
+    Also served as MessagePack or as an Arrow IPC stream when requested via Accept.
     Args:
+        request (Request): The incoming request, used for content negotiation.
         current_user (dict): The current authenticated user.
     Returns:
         FeatureResponse: A response containing the extracted features.
     """
     try:
         features = extract_features()
+        encoded = negotiated_response(request, {"features": features}, records=features)
+        if encoded is not None:
+            return encoded
         return FeatureResponse(features=features)
     except Exception as e:
         logger.error(f"Error extracting features: {e}")
@@ -34,16 +40,23 @@ def get_features(current_user: dict = Depends(get_current_user)) -> FeatureRespo
 
 
 @router.get("/training-data", **TrainingData.docs)
-def get_training_data_endpoint(current_user: dict = Depends(get_current_user)) -> TrainingDataResponse:
+def get_training_data_endpoint(request: Request, current_user: dict = Depends(get_current_user)) -> TrainingDataResponse:
     """
     Returns a dataset for ML model training.
+    Also served as MessagePack or as an Arrow IPC stream when requested via Accept.
     Args:
+        request (Request): The incoming request, used for content negotiation.
         current_user (dict): The current authenticated user.
     Returns:
         TrainingDataResponse: A response containing the training data.
     """
     try:
         training_data = get_training_data()
+        encoded = negotiated_response(
+            request, {"training_data": training_data}, records=training_data
+        )
+        if encoded is not None:
+            return encoded
         return TrainingDataResponse(training_data=training_data)
     except Exception as e:
         logger.error(f"Error fetching training data: {e}")
@@ -1,31 +1,50 @@
-from src.api.services.stats_service import get_overview_stats, get_category_stats
+from src.api.services.stats_service import (
+    DEFAULT_PERCENTILES,
+    get_approx_category_stats,
+    get_approx_crosstab,
+    get_approx_overview_stats,
+    get_approx_price_distribution,
+    get_category_stats,
+    get_crosstab,
+    get_overview_stats,
+    get_price_distribution,
+)
 from src.api.utils.jwt_handler import get_current_user
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from logging import getLogger, basicConfig, INFO
 from src.api.schemas.stats_schema import (
     Categories,
     CategoriesResponse,
+    Crosstab,
+    CrosstabResponse,
     Overview,
     OverviewResponse,
+    Prices,
+    PricesResponse,
 )
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 router = APIRouter(prefix="/api/v1/stats", tags=["Stats"])
 logger = getLogger(__name__)
 basicConfig(level=INFO, format=FORMAT)
+APPROX_DESCRIPTION = "Estimate from the book sample maintained at ingest, with 95% error margins"
 
 @router.get("/overview", **Overview.docs)
-def overview(current_user: dict = Depends(get_current_user)) -> OverviewResponse:
+def overview(
+        approx: bool = Query(False, description=APPROX_DESCRIPTION),
+        current_user: dict = Depends(get_current_user),
+    ) -> OverviewResponse:
     """
     Get overview statistics for the application.
     This endpoint returns general statistics such as total users, posts, and comments.
     Args:
+        approx (bool): Whether to estimate the statistics from the book sample.
         current_user (dict): The current user, obtained from the JWT token.
     Returns:
         OverviewResponse: A response containing the overview statistics.
     """
     try:
-        overview_stats = get_overview_stats()
+        overview_stats = get_approx_overview_stats() if approx else get_overview_stats()
         return OverviewResponse(**overview_stats)
     except Exception as e:
         logger.error(f"Error fetching overview stats: {e}")
@@ -34,19 +53,95 @@ def overview(current_user: dict = Depends(get_current_user)) -> OverviewResponse
 
 
 @router.get("/categories", **Categories.docs)
-def categories(current_user: dict = Depends(get_current_user)) -> CategoriesResponse:
+def categories(
+        approx: bool = Query(False, description=APPROX_DESCRIPTION),
+        current_user: dict = Depends(get_current_user),
+    ) -> CategoriesResponse:
     """
     Get statistics for categories.
     This endpoint returns statistics related to categories, such as the number of posts in each category.
     Args:
+        approx (bool): Whether to estimate the statistics from the book sample.
         current_user (dict): The current user, obtained from the JWT token.
     Returns:
         CategoriesResponse: A response containing the category statistics.
     """
     try:
-        categories_stats = get_category_stats()
+        categories_stats = get_approx_category_stats() if approx else get_category_stats()
         return CategoriesResponse(**categories_stats)
     except Exception as e:
         logger.error(f"Error fetching category stats: {e}")
         logger.error(f"Categories Stats: {categories_stats}, type: {type(categories_stats)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/prices", **Prices.docs)
+def prices(
+        bins: int = Query(10, ge=1, le=100, description="Number of histogram bins"),
+        percentiles: str = Query(
+            ",".join(f"{q:g}" for q in DEFAULT_PERCENTILES),
+            pattern=r"^\d+(\.\d+)?(,\d+(\.\d+)?)*$",
+            description="Comma-separated percentiles between 0 and 100",
+        ),
+        approx: bool = Query(False, description=APPROX_DESCRIPTION),
+        current_user: dict = Depends(get_current_user),
+    ) -> PricesResponse:
+    """
+    Get price histograms and percentiles, for the whole catalog and per category.
+    Args:
+        bins (int): The number of equal-width histogram bins.
+        percentiles (str): Comma-separated percentiles to report.
+        approx (bool): Whether to estimate the distributions from the book sample.
+        current_user (dict): The current user, obtained from the JWT token.
+    Returns:
+        PricesResponse: A response containing the price distributions.
+    Raises:
+        HTTPException: If a percentile is above 100.
+    """
+    requested = tuple(float(q) for q in percentiles.split(","))
+    if any(q > 100 for q in requested):
+        raise HTTPException(status_code=422, detail="Percentiles must be between 0 and 100")
+    distribution = None
+    try:
+        compute = get_approx_price_distribution if approx else get_price_distribution
+        distribution = compute(bins, requested)
+        return PricesResponse(**distribution)
+    except Exception as e:
+        logger.error(f"Error fetching price distribution: {e}")
+        logger.error(f"Price Distribution: {distribution}, type: {type(distribution)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.get("/crosstab", **Crosstab.docs)
+def crosstab(
+        rows: str = Query("category", pattern="^(category|rating|availability)$"),
+        cols: str = Query("rating", pattern="^(category|rating|availability)$"),
+        metric: str = Query("count", pattern="^(count|avg_price)$"),
+        approx: bool = Query(False, description=APPROX_DESCRIPTION),
+        current_user: dict = Depends(get_current_user),
+    ) -> CrosstabResponse:
+    """
+    Get a metric for every combination of two book dimensions, such as the
+    number of books per category and rating.
+    Args:
+        rows (str): The dimension of the matrix rows.
+        cols (str): The dimension of the matrix columns.
+        metric (str): "count" or "avg_price".
+        approx (bool): Whether to estimate the matrix from the book sample.
+        current_user (dict): The current user, obtained from the JWT token.
+    Returns:
+        CrosstabResponse: A response containing the cross-tab matrix.
+    Raises:
+        HTTPException: If rows and cols are the same dimension.
+    """
+    if rows == cols:
+        raise HTTPException(status_code=422, detail="rows and cols must be different dimensions")
+    table = None
+    try:
+        compute = get_approx_crosstab if approx else get_crosstab
+        table = compute(rows, cols, metric)
+        return CrosstabResponse(**table)
+    except Exception as e:
+        logger.error(f"Error fetching cross-tab: {e}")
+        logger.error(f"Crosstab: {table}, type: {type(table)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
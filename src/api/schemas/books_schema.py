@@ -1,3 +1,4 @@
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List
 from datetime import datetime
@@ -59,7 +60,9 @@ class Books:
                                 "scraped_at": "...",
                             }
                         ]
-                    }
+                    },
+                    "application/msgpack": {},
+                    "application/vnd.apache.arrow.stream": {},
                 },
             },
             404: {
@@ -224,3 +227,235 @@ class SearchById:
             },
         },
     }
+
+
+class SimilarBookResponse(BookResponse):
+    similarity: float
+
+    class Config:
+        title = "SimilarBookResponse"
+        json_schema_extra = {
+            "example": {
+                "id": 2,
+                "title": "Full Moon over Noah’s Ark: An Odyssey to Mount Ararat and Beyond",
+                "price": 49.43,
+                "rating": 4,
+                "availability": "In stock",
+                "category": "Travel",
+                "description": "...",
+                "image_url": "...",
+                "book_url": "...",
+                "page_number": 1,
+                "scraped_at": "...",
+                "similarity": 0.42,
+            }
+        }
+
+
+class Similar:
+    docs = {
+        "summary": "Get books similar to a book",
+        "response_model": List[SimilarBookResponse],
+        "responses": {
+            200: {
+                "description": "Similar books, ordered from most to least similar.",
+                "content": {
+                    "application/json": {
+                        "example": [
+                            {
+                                "id": 2,
+                                "title": "Full Moon over Noah’s Ark: An Odyssey to Mount Ararat and Beyond",
+                                "price": 49.43,
+                                "rating": 4,
+                                "availability": "In stock",
+                                "category": "Travel",
+                                "description": "...",
+                                "image_url": "...",
+                                "book_url": "...",
+                                "page_number": 1,
+                                "scraped_at": "...",
+                                "similarity": 0.42,
+                            }
+                        ]
+                    }
+                },
+            },
+            404: {
+                "description": "Book not found or no similar books indexed.",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "No similar books found"}
+                    }
+                },
+            },
+        },
+    }
+
+
+class Export:
+    docs = {
+        "summary": "Export the whole catalog as a Parquet, Arrow or CSV file",
+        "response_class": FileResponse,
+        "responses": {
+            200: {
+                "description": "The catalog export file. Supports HTTP Range requests.",
+                "content": {
+                    "application/vnd.apache.parquet": {},
+                    "application/vnd.apache.arrow.file": {},
+                    "text/csv": {},
+                },
+            },
+            206: {"description": "Partial content for a Range request."},
+            416: {"description": "Requested range not satisfiable."},
+            501: {
+                "description": "The requested format is not available on this server.",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Export format 'parquet' requires pyarrow"}
+                    }
+                },
+            },
+        },
+    }
+
+
+class ChangesResponse(BaseModel):
+    since: int
+    version: int
+    resync_required: bool
+    inserted: List[BookResponse]
+    updated: List[BookResponse]
+    deleted: List[int]
+
+    class Config:
+        title = "ChangesResponse"
+        json_schema_extra = {
+            "example": {
+                "since": 3,
+                "version": 4,
+                "resync_required": False,
+                "inserted": [],
+                "updated": [
+                    {
+                        "id": 1,
+                        "title": "It's Only the Himalayas",
+                        "price": 42.5,
+                        "rating": 2,
+                        "availability": "In stock",
+                        "category": "Travel",
+                        "description": "...",
+                        "image_url": "...",
+                        "book_url": "...",
+                        "page_number": 1,
+                        "scraped_at": "...",
+                    }
+                ],
+                "deleted": [17, 204],
+            }
+        }
+
+
+class Changes:
+    docs = {
+        "summary": "Get catalog changes since a version",
+        "response_model": ChangesResponse,
+        "responses": {
+            200: {
+                "description": "Books inserted, updated and deleted since the given catalog version, or resync_required if that version predates the change log.",
+                "content": {
+                    "application/json": {
+                        "example": {
+                            "since": 3,
+                            "version": 4,
+                            "resync_required": False,
+                            "inserted": [],
+                            "updated": [],
+                            "deleted": [17, 204],
+                        }
+                    }
+                },
+            },
+            401: {
+                "description": "Unauthorized access.",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Invalid authentication credentials"}
+                    }
+                },
+            },
+        },
+    }
+
+
+class PriceHistoryEntry(BaseModel):
+    version: int
+    price: Optional[float] = None
+    availability: Optional[str] = None
+    rating: Optional[int] = None
+    recorded_at: Optional[str] = None
+
+
+class HistoryResponse(BaseModel):
+    book_id: int
+    book_url: Optional[str] = None
+    history: List[PriceHistoryEntry]
+
+    class Config:
+        title = "HistoryResponse"
+        json_schema_extra = {
+            "example": {
+                "book_id": 1,
+                "book_url": "...",
+                "history": [
+                    {
+                        "version": 1,
+                        "price": 51.77,
+                        "availability": "In stock",
+                        "rating": 3,
+                        "recorded_at": "2025-07-01T10:00:00",
+                    },
+                    {
+                        "version": 4,
+                        "price": 45.17,
+                        "availability": "In stock",
+                        "rating": 3,
+                        "recorded_at": "2025-07-08T10:00:00",
+                    },
+                ],
+            }
+        }
+
+
+class History:
+    docs = {
+        "summary": "Get the price history of a book",
+        "response_model": HistoryResponse,
+        "responses": {
+            200: {
+                "description": "Price, availability and rating changes of the book, oldest first.",
+                "content": {
+                    "application/json": {
+                        "example": {
+                            "book_id": 1,
+                            "book_url": "...",
+                            "history": [
+                                {
+                                    "version": 1,
+                                    "price": 51.77,
+                                    "availability": "In stock",
+                                    "rating": 3,
+                                    "recorded_at": "2025-07-01T10:00:00",
+                                }
+                            ],
+                        }
+                    }
+                },
+            },
+            404: {
+                "description": "Book not found",
+                "content": {
+                    "application/json": {"example": {"detail": "Book not found"}}
+                },
+            },
+        },
+    }
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 
 class HealthResponse(BaseModel):
@@ -47,3 +48,178 @@ class Health:
             },
         },
     }
+
+
+class CacheStatsItem(BaseModel):
+    name: str
+    backend: str
+    entries: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_rate: Optional[float] = None
+    fills: int
+    avg_fill_ms: Optional[float] = None
+    max_fill_ms: float
+    coalesced: int
+    coalesce_timeouts: int
+    normalized: int
+    stale_hits: int
+    refreshes: int
+    refresh_errors: int
+    evictions: Optional[int] = None
+    expired: Optional[int] = None
+    approx_bytes: Optional[int] = None
+    serializations: Optional[int] = None
+    serialize_ms: Optional[float] = None
+    serialized_bytes: Optional[int] = None
+    deserializations: Optional[int] = None
+    deserialize_ms: Optional[float] = None
+    l2_hits: Optional[int] = None
+    l2_misses: Optional[int] = None
+    l2_entries: Optional[int] = None
+    l2_bytes: Optional[int] = None
+
+
+class MemoryBudgetStats(BaseModel):
+    budget_bytes: int
+    used_bytes: int
+    entries: int
+    evictions: int
+    rejected: int
+
+
+class PrewarmReport(BaseModel):
+    catalog_version: int
+    logged_requests: int
+    distinct_queries: int
+    prewarmed: int
+    cold_hit_rate: float
+    prewarmed_hit_rate: float
+    hit_rate_improvement: float
+    duration_ms: float
+    finished_at: str
+
+
+class CacheStatsResponse(BaseModel):
+    caches: List[CacheStatsItem]
+    memory: MemoryBudgetStats
+    prewarm: Optional[PrewarmReport] = None
+
+    class Config:
+        title = "CacheStatsResponse"
+        json_schema_extra = {
+            "example": {
+                "caches": [
+                    {
+                        "name": "books_cache",
+                        "backend": "MemoryBackend",
+                        "entries": 1,
+                        "maxsize": 500,
+                        "ttl": 86400,
+                        "hits": 41,
+                        "misses": 1,
+                        "hit_rate": 0.9762,
+                        "fills": 1,
+                        "avg_fill_ms": 35.2,
+                        "max_fill_ms": 35.2,
+                        "coalesced": 0,
+                        "coalesce_timeouts": 0,
+                        "normalized": 0,
+                        "stale_hits": 0,
+                        "refreshes": 0,
+                        "refresh_errors": 0,
+                        "evictions": 0,
+                        "expired": 0,
+                        "approx_bytes": 2893311,
+                    }
+                ],
+                "memory": {
+                    "budget_bytes": 268435456,
+                    "used_bytes": 3104520,
+                    "entries": 4,
+                    "evictions": 0,
+                    "rejected": 0,
+                },
+                "prewarm": {
+                    "catalog_version": 3,
+                    "logged_requests": 1200,
+                    "distinct_queries": 140,
+                    "prewarmed": 50,
+                    "cold_hit_rate": 0.8833,
+                    "prewarmed_hit_rate": 0.9625,
+                    "hit_rate_improvement": 0.0792,
+                    "duration_ms": 84.3,
+                    "finished_at": "2025-07-05T14:30:00.000000",
+                },
+            }
+        }
+
+
+class CacheHealth:
+    docs = {
+        "summary": "Cache statistics",
+        "response_model": CacheStatsResponse,
+        "responses": {
+            200: {
+                "description": "Per-cache hit, miss, eviction, expiry, fill latency and size metrics, the shared memory budget usage and the last log-driven pre-warming report.",
+                "content": {
+                    "application/json": {
+                        "example": {
+                            "caches": [
+                                {
+                                    "name": "books_cache",
+                                    "backend": "MemoryBackend",
+                                    "entries": 1,
+                                    "maxsize": 500,
+                                    "ttl": 86400,
+                                    "hits": 41,
+                                    "misses": 1,
+                                    "hit_rate": 0.9762,
+                                    "fills": 1,
+                                    "avg_fill_ms": 35.2,
+                                    "max_fill_ms": 35.2,
+                                    "coalesced": 0,
+                                    "coalesce_timeouts": 0,
+                                    "normalized": 0,
+                                    "stale_hits": 0,
+                                    "refreshes": 0,
+                                    "refresh_errors": 0,
+                                    "evictions": 0,
+                                    "expired": 0,
+                                    "approx_bytes": 2893311,
+                                }
+                            ],
+                            "memory": {
+                                "budget_bytes": 268435456,
+                                "used_bytes": 3104520,
+                                "entries": 4,
+                                "evictions": 0,
+                                "rejected": 0,
+                            },
+                            "prewarm": {
+                                "catalog_version": 3,
+                                "logged_requests": 1200,
+                                "distinct_queries": 140,
+                                "prewarmed": 50,
+                                "cold_hit_rate": 0.8833,
+                                "prewarmed_hit_rate": 0.9625,
+                                "hit_rate_improvement": 0.0792,
+                                "duration_ms": 84.3,
+                                "finished_at": "2025-07-05T14:30:00.000000",
+                            },
+                        }
+                    }
+                },
+            },
+            401: {
+                "description": "Unauthorized access.",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Invalid authentication credentials"}
+                    }
+                },
+            },
+        },
+    }
@@ -1,3 +1,4 @@
+from typing_extensions import TypedDict
 from typing import List
 from pydantic import BaseModel
 
@@ -43,7 +44,9 @@ class Features:
                                 }
                             ]
                         }
-                    }
+                    },
+                    "application/msgpack": {},
+                    "application/vnd.apache.arrow.stream": {},
                 },
             },
             404: {
@@ -88,7 +91,9 @@ class TrainingData:
                                 {"features": [45.17, 2], "label": 0}
                             ]
                         }
-                    }
+                    },
+                    "application/msgpack": {},
+                    "application/vnd.apache.arrow.stream": {},
                 },
             },
             404: {
@@ -101,7 +106,9 @@ class TrainingData:
     }
 
 
-class PredictionFeature(BaseModel):
+# A TypedDict rather than a model: items are validated into plain dicts, so
+# large prediction batches do not build one model instance per item.
+class PredictionFeature(TypedDict):
     """
     Schema representing a single feature for ML prediction.
     """
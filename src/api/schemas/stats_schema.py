@@ -1,5 +1,29 @@
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Union
+
+
+class Approximation(BaseModel):
+    """
+    Schema describing statistics estimated from the book sample (approx=true).
+    ``margins`` mirrors the layout of the response and holds, for every
+    estimated value, its margin of error at the given confidence level
+    (the true value lies within estimate ± margin); None when unknown.
+    """
+
+    sample_size: int
+    population: int
+    confidence: float
+    margins: Dict[str, Any]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "sample_size": 10000,
+                "population": 250000,
+                "confidence": 0.95,
+                "margins": {"average_price": 0.28, "ratings_distribution": {"1": 1958.4}},
+            }
+        }
 
 
 class OverviewResponse(BaseModel):
@@ -9,7 +33,11 @@ class OverviewResponse(BaseModel):
 
     total_books: int
     average_price: float
+    min_price: float
+    max_price: float
+    stddev_price: float
     ratings_distribution: Dict[str, int]
+    approximation: Optional[Approximation] = None
 
     class Config:
         title = "StatsResponse"
@@ -17,6 +45,9 @@ class OverviewResponse(BaseModel):
             "example": {
                 "total_books": 123,
                 "average_price": 45.67,
+                "min_price": 10.0,
+                "max_price": 59.99,
+                "stddev_price": 14.45,
                 "ratings_distribution": {"1": 10, "2": 20, "3": 30, "4": 40, "5": 23},
             }
         }
@@ -38,6 +69,9 @@ class Overview:
                         "example": {
                             "total_books": 123,
                             "average_price": 45.67,
+                            "min_price": 10.0,
+                            "max_price": 59.99,
+                            "stddev_price": 14.45,
                             "ratings_distribution": {
                                 "1": 10,
                                 "2": 20,
@@ -88,6 +122,7 @@ class CategoriesResponse(BaseModel):
     """
 
     categories: List[CategoryStats]
+    approximation: Optional[Approximation] = None
 
     class Config:
         json_schema_extra = {
@@ -146,3 +181,176 @@ class Categories:
             },
         },
     }
+
+
+class PriceDistribution(BaseModel):
+    """
+    Schema representing the price distribution of a set of books.
+    """
+
+    count: int
+    histogram: List[int]
+    percentiles: Dict[str, float]
+
+
+class CategoryPriceDistribution(PriceDistribution):
+    """
+    Schema representing the price distribution of a single category.
+    """
+
+    name: str
+
+
+class PricesResponse(BaseModel):
+    """
+    Schema representing price histograms and percentiles, overall and per category.
+    """
+
+    bins: int
+    bin_edges: List[float]
+    overall: PriceDistribution
+    categories: List[CategoryPriceDistribution]
+    approximation: Optional[Approximation] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "bins": 4,
+                "bin_edges": [10.0, 22.5, 35.0, 47.5, 60.0],
+                "overall": {
+                    "count": 100,
+                    "histogram": [20, 30, 35, 15],
+                    "percentiles": {"25": 23.1, "50": 34.5, "75": 45.2},
+                },
+                "categories": [
+                    {
+                        "name": "Fiction",
+                        "count": 12,
+                        "histogram": [2, 4, 5, 1],
+                        "percentiles": {"25": 24.9, "50": 36.2, "75": 44.0},
+                    }
+                ],
+            }
+        }
+
+
+class Prices:
+    """
+    OpenAPI documentation for the price distribution endpoint.
+    """
+
+    docs = {
+        "summary": "Price distribution endpoint",
+        "response_model": PricesResponse,
+        "responses": {
+            200: {
+                "description": "Price distribution retrieved successfully.",
+                "content": {
+                    "application/json": {
+                        "example": {
+                            "bins": 4,
+                            "bin_edges": [10.0, 22.5, 35.0, 47.5, 60.0],
+                            "overall": {
+                                "count": 100,
+                                "histogram": [20, 30, 35, 15],
+                                "percentiles": {"25": 23.1, "50": 34.5, "75": 45.2},
+                            },
+                            "categories": [
+                                {
+                                    "name": "Fiction",
+                                    "count": 12,
+                                    "histogram": [2, 4, 5, 1],
+                                    "percentiles": {"25": 24.9, "50": 36.2, "75": 44.0},
+                                }
+                            ],
+                        }
+                    }
+                },
+            },
+            422: {
+                "description": "Invalid bins or percentiles",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Percentiles must be between 0 and 100"}
+                    }
+                },
+            },
+            503: {
+                "description": "Service is not healthy.",
+                "content": {
+                    "application/json": {"example": {"detail": "Service is down"}}
+                },
+            },
+        },
+    }
+
+
+class CrosstabResponse(BaseModel):
+    """
+    Schema representing a metric cross-tabulated over two book dimensions.
+    """
+
+    rows: str
+    cols: str
+    metric: str
+    row_labels: List[str]
+    col_labels: List[str]
+    values: List[List[Optional[Union[int, float]]]]
+    approximation: Optional[Approximation] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "rows": "category",
+                "cols": "rating",
+                "metric": "count",
+                "row_labels": ["Fiction", "Poetry"],
+                "col_labels": ["1", "2", "3", "4", "5"],
+                "values": [[10, 12, 8, 15, 20], [2, 0, 4, 3, 1]],
+            }
+        }
+
+
+class Crosstab:
+    """
+    OpenAPI documentation for the cross-tab statistics endpoint.
+    """
+
+    docs = {
+        "summary": "Cross-tab statistics endpoint",
+        "response_model": CrosstabResponse,
+        "responses": {
+            200: {
+                "description": "Cross-tab retrieved successfully.",
+                "content": {
+                    "application/json": {
+                        "example": {
+                            "rows": "category",
+                            "cols": "rating",
+                            "metric": "avg_price",
+                            "row_labels": ["Fiction", "Poetry"],
+                            "col_labels": ["1", "2", "3", "4", "5"],
+                            "values": [
+                                [31.2, 35.8, 40.1, 28.4, 36.9],
+                                [22.5, None, 41.0, 30.2, 18.7],
+                            ],
+                        }
+                    }
+                },
+            },
+            422: {
+                "description": "Invalid dimensions or metric",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "rows and cols must be different dimensions"}
+                    }
+                },
+            },
+            503: {
+                "description": "Service is not healthy.",
+                "content": {
+                    "application/json": {"example": {"detail": "Service is down"}}
+                },
+            },
+        },
+    }
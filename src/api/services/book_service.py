@@ -1,17 +1,32 @@
-from utils.database_manager import DatabaseManager
+from utils.similarity_index import build_similarity_index
+from utils.database_manager import DatabaseManager, DatabaseError
+from utils.catalog import ensure_change_log, ensure_price_history, get_catalog_version
 from src.api.utils.cache import (
     cache_with_books,
     cache_with_books_id,
     cache_with_search_books,
     cache_with_top_rated_books,
     cache_with_price_range_books,
+    cache_with_similar_books,
+    cache_with_book_history,
+    normalize_args,
+    normalize_text,
+    normalize_min_price,
+    normalize_max_price,
 )
+from src.api.utils.record_store import book_ids, resolve_books
 from logging import getLogger, basicConfig, INFO
+from threading import Lock
 from pathlib import Path
+from array import array
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DB_PATH = Path(__file__).resolve().parents[3] / "tmp" / "bookonthetable.db"
 manager = DatabaseManager(str(DB_PATH))
+price_history_lock = Lock()
+price_history_ready = False
+change_log_lock = Lock()
+change_log_start = None
 
 
 logger = getLogger(__name__)
@@ -19,59 +34,84 @@ basicConfig(level=INFO, format=FORMAT)
 
 
 @cache_with_books
+def _get_all_book_ids() -> array:
+    """
+    Retrieve the IDs of all books.
+    Returns:
+        array: The book IDs, in ID order.
+    """
+    try:
+        logger.info("Fetching all book IDs from the database.")
+        ids = book_ids(manager.select("SELECT id FROM books ORDER BY id"))
+        logger.info(f"Retrieved {len(ids)} book IDs.")
+        return ids
+    except Exception as e:
+        logger.error(f"Error fetching books: {e}")
+        return None
+
+
 def get_all_books() -> list:
     """
     Retrieve all books from the database.
     Returns:
-        list: A list of dictionaries, each representing a book.
-        If an error occurs, returns an empty list.
+        list: A list of read-only mappings, each representing a book.
+        If an error occurs, returns None.
     """
     try:
-        logger.info("Fetching all books from the database.")
-        books = manager.select("SELECT * FROM books")
-        books = [dict(row) for row in books]
-        logger.info(f"Retrieved {len(books)}, type: {type(books)}")
-        return books
+        return resolve_books(_get_all_book_ids())
     except Exception as e:
-        logger.error(f"Error fetching books: {e}")
+        logger.error(f"Error resolving books: {e}")
         return None
 
 
 @cache_with_books_id
+def _get_book_ids_by_id(book_id: int) -> array:
+    """
+    Check whether a book exists.
+    Args:
+        book_id (int): The ID of the book.
+    Returns:
+        array: The ID itself if the book exists, otherwise an empty array.
+    """
+    try:
+        logger.info(f"Fetching book with ID {book_id} from the database.")
+        return book_ids(manager.select("SELECT id FROM books WHERE id = ? LIMIT 1", (book_id,)))
+    except Exception as e:
+        logger.error(f"Error fetching book by ID {book_id}: {e}")
+        return None
+
+
 def get_book_by_id(book_id: int) -> list:
     """
     Retrieve a specific book by its ID.
     Args:
         book_id (int): The ID of the book to retrieve.
     Returns:
-        list: A list containing a single dictionary representing the book if found, otherwise an empty list.
+        list: A list containing a single mapping representing the book if found, otherwise an empty list.
     """
     try:
-        logger.info(f"Fetching book with ID {book_id} from the database.")
-        rows = manager.select("SELECT * FROM books WHERE id = ? LIMIT 1", (book_id,))
-        book = [dict(row) for row in rows]
-        logger.info(f"Retrieved book: {book}, type: {type(book)}")
-        return book
+        return resolve_books(_get_book_ids_by_id(book_id))
     except Exception as e:
-        logger.error(f"Error fetching book with ID {book_id}: {e}")
+        logger.error(f"Error resolving book {book_id}: {e}")
         return None
 
 
+@normalize_args(title=normalize_text, category=normalize_text)
 @cache_with_search_books
-def search_books(title: str = None, category: str = None) -> list:
+def _search_book_ids(title: str = None, category: str = None) -> array:
     """
-    Search for books by title and/or category.
+    Find the IDs of the books matching a title and/or category.
     Args:
         title (str, optional): The title or part of the title to search for.
         category (str, optional): The category to filter books by.
     Returns:
-        list: A list of dictionaries representing the books that match the search criteria.
+        array: The IDs of the matching books, in ID order.
     """
     try:
         logger.info(
             f"Searching for books with title '{title}' and category '{category}'."
         )
-        query = "SELECT * FROM books WHERE 1=1"
+        query = "SELECT id FROM books WHERE 1=1"
         params = []
 
         if title:
@@ -81,41 +121,91 @@ def search_books(title: str = None, category: str = None) -> list:
         if category:
             query += " AND LOWER(category) = ?"
             params.append(category.lower())
-        results = manager.select(query, tuple(params))
-        results = [dict(row) for row in results]
-        logger.info(f"Retrieved Search: {results}, type: {type(results)}")
-        return results
+        ids = book_ids(manager.select(query + " ORDER BY id", tuple(params)))
+        logger.info(f"Search matched {len(ids)} books.")
+        return ids
     except Exception as e:
         logger.error(f"Error searching for books: {e}")
         return None
 
 
+def search_books(title: str = None, category: str = None) -> list:
+    """
+    Search for books by title and/or category.
+    Args:
+        title (str, optional): The title or part of the title to search for.
+        category (str, optional): The category to filter books by.
+    Returns:
+        list: A list of read-only mappings representing the books that match the search criteria.
+    """
+    try:
+        return resolve_books(_search_book_ids(title, category))
+    except Exception as e:
+        logger.error(f"Error resolving search results: {e}")
+        return None
+
+
 @cache_with_top_rated_books
-def get_top_rated_books(limit: int = 10) -> list:
+def _get_top_rated_book_ids(limit: int = 10) -> array:
     """
-    Retrieve the top-rated books from the database.
+    Retrieve the IDs of the top-rated books.
     Args:
-        limit (int): The maximum number of top-rated books to retrieve. Default is 10.
+        limit (int): The maximum number of books. Default is 10.
     Returns:
-        list: A list of dictionaries representing the top-rated books.
+        array: The book IDs, best rated first.
     """
     try:
         logger.info(f"Fetching top {limit} rated books from the database.")
         query = """
-            SELECT * FROM books
+            SELECT id FROM books
             ORDER BY rating DESC, title ASC
             LIMIT ?
         """
-        top_books = manager.select(query, (limit,))
-        top_books = [dict(row) for row in top_books]
-        logger.info(f"Retrieved Top Books: {top_books}, type: {type(top_books)}")
-        return top_books
+        return book_ids(manager.select(query, (limit,)))
     except Exception as e:
         logger.error(f"Error fetching top-rated books: {e}")
         return None
 
 
+def get_top_rated_books(limit: int = 10) -> list:
+    """
+    Retrieve the top-rated books from the database.
+    Args:
+        limit (int): The maximum number of top-rated books to retrieve. Default is 10.
+    Returns:
+        list: A list of read-only mappings representing the top-rated books.
+    """
+    try:
+        return resolve_books(_get_top_rated_book_ids(limit))
+    except Exception as e:
+        logger.error(f"Error resolving top-rated books: {e}")
+        return None
+
+
+@normalize_args(min_price=normalize_min_price, max_price=normalize_max_price)
 @cache_with_price_range_books
+def _get_price_range_book_ids(min_price: float = 0.0, max_price: float = 0.0) -> array:
+    """
+    Retrieve the IDs of the books within a price range.
+    Args:
+        min_price (float): The minimum price. Default is 0.0.
+        max_price (float): The maximum price. Default is 0.0.
+    Returns:
+        array: The book IDs, cheapest first.
+    """
+    try:
+        logger.info(f"Fetching books with price between {min_price} and {max_price}.")
+        query = """
+            SELECT id FROM books
+            WHERE price BETWEEN ? AND ?
+            ORDER BY price ASC
+        """
+        return book_ids(manager.select(query, (min_price, max_price)))
+    except Exception as e:
+        logger.error(f"Error fetching books by price range: {e}")
+        return None
+
+
 def get_price_range_books(min_price: float = 0.0, max_price: float = 0.0) -> list:
     """
     Retrieve books within a specified price range.
@@ -123,19 +213,205 @@ def get_price_range_books(min_price: float = 0.0, max_price: float = 0.0) -> lis
         min_price (float): The minimum price of the books to retrieve. Default is 0.0.
         max_price (float): The maximum price of the books to retrieve. Default is infinity.
     Returns:
-        list: A list of dictionaries representing the books within the specified price range.
+        list: A list of read-only mappings representing the books within the specified price range.
     """
     try:
-        logger.info(f"Fetching books with price between {min_price} and {max_price}.")
+        return resolve_books(_get_price_range_book_ids(min_price, max_price))
+    except Exception as e:
+        logger.error(f"Error resolving books by price range: {e}")
+        return None
+
+
+def ensure_similarity_index() -> None:
+    """
+    Build the similarity index at startup if the batch job has not filled it
+    yet; setup/creator.sql creates the table empty. Requests never build it,
+    as the build scores every pair of books.
+    """
+    try:
+        built = manager.select(
+            "SELECT EXISTS (SELECT 1 FROM book_similarities) AS built"
+        )[0]["built"]
+    except DatabaseError:
+        built = False
+    if built:
+        return
+    try:
+        logger.info("Similarity index empty, building it now.")
+        build_similarity_index(manager)
+    except Exception as e:
+        logger.error(f"Error building the similarity index: {e}")
+
+
+@cache_with_similar_books
+def get_similar_books(book_id: int, limit: int = 10) -> list:
+    """
+    Retrieve the books most similar to a given book from the precomputed index.
+    Args:
+        book_id (int): The ID of the reference book.
+        limit (int): The maximum number of similar books to retrieve. Default is 10.
+    Returns:
+        list: A list of dictionaries representing the similar books, each with
+        a ``similarity`` score, ordered from most to least similar.
+    """
+    try:
+        logger.info(f"Fetching {limit} books similar to book {book_id}.")
         query = """
-            SELECT * FROM books
-            WHERE price BETWEEN ? AND ?
-            ORDER BY price ASC
+            SELECT b.*, s.score AS similarity
+            FROM book_similarities s
+            JOIN books b ON b.id = s.similar_id
+            WHERE s.book_id = ?
+            ORDER BY s.rank
+            LIMIT ?
         """
-        books = manager.select(query, (min_price, max_price))
+        books = manager.select(query, (book_id, limit))
         books = [dict(row) for row in books]
-        logger.info(f"Retrieved Price Range Books: {books}, type: {type(books)}")
+        logger.info(f"Retrieved {len(books)} similar books for book {book_id}.")
         return books
     except Exception as e:
-        logger.error(f"Error fetching books by price range: {e}")
+        logger.error(f"Error fetching books similar to book {book_id}: {e}")
+        return None
+
+
+def _ensure_price_history() -> None:
+    """
+    Create the price history table on first use and seed it from the current
+    catalog if it is still empty.
+    """
+    global price_history_ready
+    if price_history_ready:
+        return
+    with price_history_lock:
+        if not price_history_ready:
+            if ensure_price_history(manager):
+                logger.info("Price history seeded from the current catalog.")
+            price_history_ready = True
+
+
+@cache_with_book_history
+def get_book_history(book_id: int) -> dict:
+    """
+    Retrieve the price, availability and rating history of a book.
+    History rows are keyed by ``book_url`` and only written when one of those
+    fields changed, so each row starts a period lasting until the next one.
+    Args:
+        book_id (int): The ID of the book.
+    Returns:
+        dict: A dictionary containing:
+            - book_id: The requested ID.
+            - book_url: The stable key of the book.
+            - history: Rows with version, price, availability, rating and
+              recorded_at, oldest first.
+        An empty dictionary if the book does not exist.
+    """
+    try:
+        logger.info(f"Fetching price history of book {book_id}.")
+        _ensure_price_history()
+        book = manager.select("SELECT book_url FROM books WHERE id = ?", (book_id,))
+        if not book:
+            return {}
+        book_url = book[0]["book_url"]
+        rows = manager.select(
+            """
+            SELECT version, price, availability, rating, recorded_at
+            FROM book_price_history
+            WHERE book_url = ?
+            ORDER BY version
+            """,
+            (book_url,),
+        )
+        logger.info(f"Retrieved {len(rows)} history rows for book {book_id}.")
+        return {"book_id": book_id, "book_url": book_url, "history": [dict(row) for row in rows]}
+    except Exception as e:
+        logger.error(f"Error fetching price history of book {book_id}: {e}")
+        return None
+
+
+def _ensure_change_log() -> int:
+    """
+    Create the change log on first use and remember the oldest catalog
+    version it covers.
+    Returns:
+        int: The oldest catalog version the change log covers.
+    """
+    global change_log_start
+    if change_log_start is None:
+        with change_log_lock:
+            if change_log_start is None:
+                change_log_start = ensure_change_log(manager)
+    return change_log_start
+
+
+def get_book_changes(since: int) -> dict:
+    """
+    Retrieve the books inserted, updated and deleted after a catalog version.
+    Changes are collapsed per book: a book inserted and later updated is
+    reported as inserted, and a book inserted and later deleted is omitted.
+    Versions older than the start of the change log cannot be served as a
+    delta; they are answered with ``resync_required`` and no changes.
+    Args:
+        since (int): The catalog version the client last synchronised to.
+    Returns:
+        dict: A dictionary containing:
+            - since: The requested version.
+            - version: The current catalog version.
+            - resync_required: Whether the client must reload the whole
+              catalog and synchronise from ``version`` instead.
+            - inserted: Current rows of the books inserted since then.
+            - updated: Current rows of the books updated since then.
+            - deleted: IDs of the books deleted since then.
+    """
+    try:
+        logger.info(f"Fetching book changes since catalog version {since}.")
+        resync_required = since < _ensure_change_log()
+        version = get_catalog_version(manager)
+        changes = []
+        if since < version and not resync_required:
+            changes = manager.select(
+                """
+                SELECT book_id, operation FROM book_changes
+                WHERE version > ?
+                ORDER BY id
+                """,
+                (since,),
+            )
+
+        first, last = {}, {}
+        for change in changes:
+            first.setdefault(change["book_id"], change["operation"])
+            last[change["book_id"]] = change["operation"]
+
+        inserted, updated, deleted = [], [], []
+        for book_id, operation in last.items():
+            if operation == "delete":
+                if first[book_id] != "insert":
+                    deleted.append(book_id)
+            elif first[book_id] == "insert":
+                inserted.append(book_id)
+            else:
+                updated.append(book_id)
+
+        rows = {}
+        live_ids = inserted + updated
+        for start in range(0, len(live_ids), 500):
+            chunk = live_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in manager.select(
+                f"SELECT * FROM books WHERE id IN ({placeholders})", tuple(chunk)
+            ):
+                rows[row["id"]] = dict(row)
+
+        logger.info(
+            f"Changes since {since}: {len(inserted)} inserted, {len(updated)} updated, {len(deleted)} deleted."
+        )
+        return {
+            "since": since,
+            "version": version,
+            "resync_required": resync_required,
+            "inserted": [rows[i] for i in sorted(inserted) if i in rows],
+            "updated": [rows[i] for i in sorted(updated) if i in rows],
+            "deleted": sorted(deleted),
+        }
+    except Exception as e:
+        logger.error(f"Error fetching book changes since {since}: {e}")
         return None
@@ -0,0 +1,143 @@
+from utils.database_manager import DatabaseManager
+from utils.catalog import get_catalog_version
+from logging import getLogger, basicConfig, INFO
+from threading import Lock
+from pathlib import Path
+import csv
+import os
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DB_PATH = Path(__file__).resolve().parents[3] / "tmp" / "bookonthetable.db"
+EXPORT_DIR = Path("/tmp") / "bookonthetable_exports"
+BATCH_SIZE = 10_000
+
+EXPORT_FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+    "csv": "text/csv",
+}
+COLUMNS = [
+    ("id", "int64"),
+    ("title", "string"),
+    ("price", "float64"),
+    ("rating", "int64"),
+    ("availability", "string"),
+    ("category", "string"),
+    ("description", "string"),
+    ("image_url", "string"),
+    ("book_url", "string"),
+    ("page_number", "int64"),
+    ("scraped_at", "string"),
+]
+
+manager = DatabaseManager(str(DB_PATH))
+export_lock = Lock()
+
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+
+class ExportUnavailable(Exception):
+    """Raised when an export format needs an optional library that is missing."""
+
+    pass
+
+
+def _iter_batches():
+    """
+    Stream the books table in batches of rows, ordered by ID.
+    Yields:
+        list: Up to BATCH_SIZE tuples in COLUMNS order.
+    """
+    columns = ", ".join(name for name, _ in COLUMNS)
+    with manager.transaction() as conn:
+        cursor = conn.execute(f"SELECT {columns} FROM books ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+
+
+def _write_csv(path: Path) -> None:
+    """
+    Write the books table to a CSV file.
+    Args:
+        path (Path): Destination file.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow([name for name, _ in COLUMNS])
+        for rows in _iter_batches():
+            writer.writerows(rows)
+
+
+def _write_arrow(path: Path, export_format: str) -> None:
+    """
+    Write the books table to a Parquet or Arrow IPC file, one record batch
+    per database batch.
+    Args:
+        path (Path): Destination file.
+        export_format (str): Either "parquet" or "arrow".
+    """
+    schema = pyarrow.schema(
+        [(name, pyarrow.type_for_alias(type_name)) for name, type_name in COLUMNS]
+    )
+    if export_format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pyarrow.ipc.new_file(str(path), schema)
+    with writer:
+        for rows in _iter_batches():
+            columns = list(zip(*rows))
+            writer.write_batch(
+                pyarrow.RecordBatch.from_arrays(
+                    [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema,
+                )
+            )
+
+
+def get_catalog_export(export_format: str) -> Path:
+    """
+    Return the export file of the books table in the requested format.
+    Files are generated once per catalog version and kept on disk; exports
+    of older versions are removed when a new one is written.
+    Args:
+        export_format (str): One of "parquet", "arrow" or "csv".
+    Returns:
+        Path: The path of the export file.
+    Raises:
+        ExportUnavailable: If the format needs pyarrow and it is not installed.
+    """
+    if export_format != "csv" and pyarrow is None:
+        raise ExportUnavailable(f"Export format '{export_format}' requires pyarrow")
+
+    version = get_catalog_version(manager)
+    path = EXPORT_DIR / f"books-v{version}.{export_format}"
+    if path.exists():
+        return path
+
+    with export_lock:
+        if path.exists():
+            return path
+        logger.info(f"Generating {export_format} export for catalog version {version}.")
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        if export_format == "csv":
+            _write_csv(partial)
+        else:
+            _write_arrow(partial, export_format)
+        os.replace(partial, path)
+
+        for stale in EXPORT_DIR.glob(f"books-v*.{export_format}"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        logger.info(f"Export written to {path} ({path.stat().st_size} bytes).")
+    return path
@@ -1,4 +1,6 @@
 from utils.database_manager import DatabaseManager
+from src.api.utils.cache import cache_stats, memory_budget
+from src.api.services import prewarm_service
 from logging import getLogger, basicConfig, INFO
 from pathlib import Path
 import os
@@ -23,3 +25,23 @@ def check_health() -> dict:
         return {"status": "ok", "message": "API is healthy and database is connected."}
     except Exception as e:
         return {"status": "error", "message": f"Database connection failed: {e}"}
+
+
+def get_cache_stats() -> dict:
+    """
+    Collect hit, miss, eviction, expiry, fill latency and size metrics of every cache,
+    the usage of the shared memory budget and the report of the last log-driven
+    pre-warming.
+    Returns:
+        dict: A dictionary with a list of per-cache metrics under "caches", the
+        memory budget under "memory" and the pre-warming report under "prewarm".
+    """
+    try:
+        return {
+            "caches": cache_stats(),
+            "memory": memory_budget.stats(),
+            "prewarm": prewarm_service.last_prewarm_report,
+        }
+    except Exception as e:
+        logger.error(f"Error collecting cache stats: {e}")
+        return None
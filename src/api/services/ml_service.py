@@ -1,11 +1,19 @@
 from src.api.utils.cache import cache_with_ml_features, cache_with_ml_training_data, cache_with_predict
 from src.api.services.book_service import get_all_books
 from logging import getLogger, basicConfig, INFO
+from operator import attrgetter, itemgetter
+from itertools import repeat
+import numpy as np
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 logger = getLogger(__name__)
 basicConfig(level=INFO, format=FORMAT)
 
+# The model labels an item 1 when it costs at least PRICE_THRESHOLD or
+# belongs to one of POSITIVE_CATEGORIES.
+PRICE_THRESHOLD = 30.0
+POSITIVE_CATEGORIES = ("Travel",)
+
 @cache_with_ml_features
 def extract_features() -> list:
     """
@@ -54,22 +62,77 @@ def get_training_data() -> list:
         logger.error(f"Error retrieving training data: {e}")
         return None
 
+@cache_with_ml_features
+def get_category_index() -> dict:
+    """
+    Builds the category dictionary used to encode prediction batches: every
+    catalog category (books without one are skipped), plus the categories
+    the model scores, gets an integer code. Cached until the catalog changes.
+    Returns:
+        dict: A dictionary containing:
+            - codes: Category name to code.
+            - positive: Boolean array indexed by code, True for the categories
+              labelled 1 by the model, with a trailing False for unknown
+              categories (code -1).
+    """
+    try:
+        logger.info("Building the category dictionary for predictions.")
+        categories = {book["category"] for book in extract_features() if book["category"]}
+        names = sorted(categories | set(POSITIVE_CATEGORIES))
+        positive = np.zeros(len(names) + 1, dtype=bool)
+        positive[: len(names)] = [name in POSITIVE_CATEGORIES for name in names]
+        return {"codes": {name: code for code, name in enumerate(names)}, "positive": positive}
+    except Exception as e:
+        logger.error(f"Error building the category dictionary: {e}")
+        return None
+
+
+def encode_features(features: list, codes: dict) -> tuple:
+    """
+    Converts a batch of prediction features into NumPy columns.
+    Args:
+        features (list): Dicts (or objects) with 'price' and 'category'.
+        codes (dict): Category dictionary from ``get_category_index``.
+    Returns:
+        tuple: A float64 price array and an int64 array of category codes
+        (-1 for categories outside the dictionary).
+    """
+    if not features:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+    getter = itemgetter if isinstance(features[0], dict) else attrgetter
+    prices = np.fromiter(map(getter("price"), features), dtype=np.float64, count=len(features))
+    categories = map(codes.get, map(getter("category"), features), repeat(-1))
+    return prices, np.fromiter(categories, dtype=np.int64, count=len(features))
+
+
+def score(prices: np.ndarray, codes: np.ndarray, positive: np.ndarray) -> np.ndarray:
+    """
+    Evaluates the model on encoded columns in one vectorized pass.
+    Args:
+        prices (np.ndarray): Item prices.
+        codes (np.ndarray): Item category codes from ``encode_features``.
+        positive (np.ndarray): Category mask from ``get_category_index``.
+    Returns:
+        np.ndarray: The predicted labels (0 or 1) as int64.
+    """
+    return ((prices >= PRICE_THRESHOLD) | positive[codes]).astype(np.int64)
+
+
 @cache_with_predict
 def predict(features: list) -> list:
     """
     Predicts labels based on features for ML processing.
+    The batch is encoded into NumPy columns and scored in one vectorized pass.
     Args:
         features (list): A list of dicts with 'price' and 'category' for each item.
     Returns:
         list: A list of predicted labels (0 or 1).
     """
     try:
-        logger.info("Predicting labels based on features for ML processing.")
-        prediction = [
-            1 if feat.price >= 30.0 or feat.category == "Travel"
-            else 0 for feat in features
-        ]
-        return prediction
+        logger.info(f"Predicting labels for a batch of {len(features)} items.")
+        index = get_category_index()
+        prices, codes = encode_features(features, index["codes"])
+        return score(prices, codes, index["positive"]).tolist()
     except Exception as e:
         logger.error(f"Error during prediction: {e}")
         return None
\ No newline at end of file
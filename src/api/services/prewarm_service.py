@@ -0,0 +1,162 @@
+from src.api.services.book_service import (
+    search_books,
+    get_top_rated_books,
+    get_price_range_books,
+)
+from src.api.utils.cache import current_catalog_version
+from utils.database_manager import DatabaseManager
+from logging import getLogger, basicConfig, INFO
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from time import perf_counter
+from json import loads, dumps
+from pathlib import Path
+import asyncio
+from src.api.config import PREWARM_TOP_N, PREWARM_WINDOW_DAYS
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DB_PATH = Path(__file__).resolve().parents[3] / "tmp" / "bookonthetable.db"
+manager = DatabaseManager(str(DB_PATH))
+
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+# Logged endpoint -> (service, builder of the positional arguments the route
+# passes to it from the logged query parameters, with the route defaults).
+PREWARM_ENDPOINTS = {
+    "/api/v1/books/search": (
+        search_books,
+        lambda params: (params.get("title"), params.get("category")),
+    ),
+    "/api/v1/books/top-rated": (
+        get_top_rated_books,
+        lambda params: (int(params.get("limit", 10)),),
+    ),
+    "/api/v1/books/price-range": (
+        get_price_range_books,
+        lambda params: (float(params.get("min_price", 0.0)), float(params.get("max_price", 1e9))),
+    ),
+}
+
+last_prewarm_report = None
+
+
+def get_logged_requests(window_days: float = PREWARM_WINDOW_DAYS) -> list:
+    """
+    Read the successful requests to the pre-warmable endpoints, oldest first.
+    Args:
+        window_days (float): How many days of logs to consider.
+    Returns:
+        list: (endpoint, service arguments) tuples, one per logged request.
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=window_days)).strftime("%Y-%m-%d %H:%M:%S")
+    placeholders = ", ".join("?" for _ in PREWARM_ENDPOINTS)
+    rows = manager.select(
+        f"""
+        SELECT endpoint, query_params FROM logs
+        WHERE status_code = 200 AND method = 'GET' AND timestamp >= ?
+          AND endpoint IN ({placeholders})
+        ORDER BY id
+        """,
+        (since, *PREWARM_ENDPOINTS),
+    )
+    requests = []
+    for row in rows:
+        _, build_args = PREWARM_ENDPOINTS[row["endpoint"]]
+        try:
+            args = build_args(loads(row["query_params"] or "{}"))
+        except (ValueError, TypeError):
+            continue
+        requests.append((row["endpoint"], args))
+    return requests
+
+
+def replay_hit_rate(requests: list, warmed: set) -> float:
+    """
+    Hit rate the pre-warmable caches would have had serving ``requests``
+    right after a catalog change, starting with only ``warmed`` cached.
+    Args:
+        requests (list): (endpoint, arguments) tuples in arrival order.
+        warmed (set): The (endpoint, arguments) entries cached beforehand.
+    Returns:
+        float: The fraction of requests served from the cache.
+    """
+    if not requests:
+        return 0.0
+    cached = set(warmed)
+    hits = 0
+    for request in requests:
+        if request in cached:
+            hits += 1
+        else:
+            cached.add(request)
+    return hits / len(requests)
+
+
+def prewarm_caches(
+    top_n: int = PREWARM_TOP_N, window_days: float = PREWARM_WINDOW_DAYS
+) -> dict:
+    """
+    Fill the search, price range and top-rated caches with the ``top_n``
+    most frequent queries found in the request logs.
+    The report compares the hit rate of replaying the logged requests on
+    cold caches with the hit rate after pre-warming.
+    Args:
+        top_n (int): Number of distinct queries to pre-warm.
+        window_days (float): How many days of logs to mine.
+    Returns:
+        dict: The pre-warming report, or None if the logs could not be read.
+    """
+    global last_prewarm_report
+    start = perf_counter()
+    try:
+        requests = get_logged_requests(window_days)
+    except Exception as e:
+        logger.error(f"Error reading request logs for pre-warming: {e}")
+        return None
+
+    hot = [request for request, _ in Counter(requests).most_common(top_n)]
+    warmed = set()
+    for endpoint, args in hot:
+        service, _ = PREWARM_ENDPOINTS[endpoint]
+        try:
+            if service(*args) is not None:
+                warmed.add((endpoint, args))
+        except Exception as e:
+            logger.error(f"Error pre-warming {endpoint} {args}: {e}")
+
+    cold_hit_rate = replay_hit_rate(requests, set())
+    warm_hit_rate = replay_hit_rate(requests, warmed)
+    report = {
+        "catalog_version": current_catalog_version(),
+        "logged_requests": len(requests),
+        "distinct_queries": len(set(requests)),
+        "prewarmed": len(warmed),
+        "cold_hit_rate": round(cold_hit_rate, 4),
+        "prewarmed_hit_rate": round(warm_hit_rate, 4),
+        "hit_rate_improvement": round(warm_hit_rate - cold_hit_rate, 4),
+        "duration_ms": round((perf_counter() - start) * 1000, 1),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+    }
+    last_prewarm_report = report
+    logger.info(f"cache_prewarm {dumps(report)}")
+    return report
+
+
+async def prewarm_on_catalog_change(interval: float) -> None:
+    """
+    Pre-warm the caches once at startup and again every time the catalog
+    version changes, checking it every ``interval`` seconds until cancelled.
+    Args:
+        interval (float): Seconds between two catalog version checks.
+    """
+    prewarmed_version = None
+    while True:
+        try:
+            version = await asyncio.to_thread(current_catalog_version)
+            if version != prewarmed_version:
+                await asyncio.to_thread(prewarm_caches)
+                prewarmed_version = version
+        except Exception as e:
+            logger.error(f"Error pre-warming caches: {e}")
+        await asyncio.sleep(interval)
@@ -1,47 +1,87 @@
 from utils.database_manager import DatabaseManager
-from src.api.utils.cache import cache_with_stats
+from src.api.utils.cache import cache_with_stats, normalize_args
+from src.api.config import STATS_SAMPLE_SIZE
+from utils.aggregates import ensure_aggregates
 from logging import getLogger, basicConfig, INFO
 from pathlib import Path
+from threading import Lock
+from math import sqrt
+import numpy as np
 
 FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DB_PATH = Path(__file__).resolve().parents[3] / "tmp" / "bookonthetable.db"
 manager = DatabaseManager(str(DB_PATH))
+aggregates_lock = Lock()
+aggregates_ready = False
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+CROSSTAB_DIMENSIONS = {"category": "category", "rating": "rating", "availability": "availability"}
+CROSSTAB_METRICS = {"count": "COUNT(*)", "avg_price": "AVG(price)"}
+# Two-sided 95% normal quantile used for the margins of approximate stats.
+CONFIDENCE = 0.95
+Z_SCORE = 1.959963984540054
 
 logger = getLogger(__name__)
 basicConfig(level=INFO, format=FORMAT)
 
 
+def _ensure_aggregates() -> None:
+    """
+    Create the stats aggregate tables and the book sample on first use if the
+    catalog predates them, resizing the sample to STATS_SAMPLE_SIZE.
+    """
+    global aggregates_ready
+    if aggregates_ready:
+        return
+    with aggregates_lock:
+        if not aggregates_ready:
+            if ensure_aggregates(manager, STATS_SAMPLE_SIZE):
+                logger.info("Stats aggregate tables created from the books table.")
+            aggregates_ready = True
+
+
+@cache_with_stats
 def get_overview_stats() -> dict:
     """
     Retrieve overview statistics for the book collection.
+    Everything is derived from the aggregate tables maintained at ingest
+    (one row per category and per rating) and cached until the catalog changes.
 
     Returns:
         dict: A dictionary containing:
             - total_books: Total number of books in the database.
             - average_price: Average price of all books.
+            - min_price: Lowest book price.
+            - max_price: Highest book price.
+            - stddev_price: Population standard deviation of the prices.
             - ratings_distribution: A dictionary with ratings as keys and their counts as values.
     """
     try:
-        logger.info("Retrieving overview statistics from the database.")
-        total_books = manager.select("SELECT COUNT(*) as total FROM books")[0]["total"]
-        avg_price = (
-            manager.select("SELECT AVG(price) as avg_price FROM books")[0]["avg_price"]
-            or 0.0
-        )
-        ratings = manager.select(
+        logger.info("Retrieving overview statistics from the aggregate tables.")
+        _ensure_aggregates()
+        totals = manager.select(
             """
-            SELECT rating, COUNT(*) as count FROM books GROUP BY rating ORDER BY rating
+            SELECT COALESCE(SUM(count), 0) AS total_books,
+                   COALESCE(SUM(price_count), 0) AS price_count,
+                   COALESCE(SUM(price_sum), 0) AS price_sum,
+                   COALESCE(SUM(price_sumsq), 0) AS price_sumsq,
+                   MIN(min_price) AS min_price, MAX(max_price) AS max_price
+            FROM category_stats
         """
-        )
-        ratings_distribution = {str(row["rating"]): row["count"] for row in ratings}
-        logger.info(
-            f"Overview stats - Total Books: {total_books}, Average Price: {avg_price}, Ratings Distribution: {ratings_distribution}"
-        )
-        return {
-            "total_books": total_books,
+        )[0]
+        ratings = manager.select("SELECT rating, count FROM rating_stats ORDER BY rating")
+        price_count = totals["price_count"]
+        avg_price = totals["price_sum"] / price_count if price_count else 0.0
+        variance = totals["price_sumsq"] / price_count - avg_price ** 2 if price_count else 0.0
+        stats = {
+            "total_books": totals["total_books"],
             "average_price": avg_price,
-            "ratings_distribution": ratings_distribution,
+            "min_price": totals["min_price"] or 0.0,
+            "max_price": totals["max_price"] or 0.0,
+            "stddev_price": sqrt(max(variance, 0.0)),
+            "ratings_distribution": {str(row["rating"]): row["count"] for row in ratings},
         }
+        logger.info(f"Overview stats: {stats}")
+        return stats
     except Exception as e:
         logger.error(f"Error retrieving overview statistics: {e}")
         return None
@@ -50,7 +90,8 @@ def get_overview_stats() -> dict:
 @cache_with_stats
 def get_category_stats() -> dict:
     """
-    Retrieve detailed statistics by category.
+    Retrieve detailed statistics by category, read from the per-category
+    aggregate table.
 
     Returns:
         dict: A dictionary with a list of categories, each containing:
@@ -59,12 +100,13 @@ def get_category_stats() -> dict:
             - average_price: Average price of books in the category.
     """
     try:
-        logger.info("Retrieving category statistics from the database.")
+        logger.info("Retrieving category statistics from the aggregate tables.")
+        _ensure_aggregates()
         categories = manager.select(
             """
-            SELECT category, COUNT(*) as total_books, AVG(price) as average_price
-            FROM books
-            GROUP BY category
+            SELECT category, count AS total_books,
+                   CASE WHEN price_count > 0 THEN price_sum / price_count END AS average_price
+            FROM category_stats
             ORDER BY category
         """
         )
@@ -83,3 +125,589 @@ def get_category_stats() -> dict:
     except Exception as e:
         logger.error(f"Error retrieving category statistics: {e}")
         return None
+
+
+@cache_with_stats
+def get_price_column() -> dict:
+    """
+    Load the prices of the catalog as one NumPy column, sorted by category and
+    then by price through the (category, price) index, so every category is a
+    contiguous, already sorted slice. Books without a price are left out.
+    Cached until the catalog changes.
+
+    Returns:
+        dict: A dictionary containing:
+            - prices: float64 array of the prices.
+            - categories: Category names, in the order of their slices.
+            - counts: int64 array with the number of prices per category.
+    """
+    try:
+        logger.info("Loading the price column.")
+        _ensure_aggregates()
+        rows = manager.select(
+            """
+            SELECT category, price FROM books
+            WHERE price IS NOT NULL
+            ORDER BY category, price
+        """
+        )
+        categories, counts = [], []
+        for row in rows:
+            category = row["category"] or ""
+            if categories and categories[-1] == category:
+                counts[-1] += 1
+            else:
+                categories.append(category)
+                counts.append(1)
+        return {
+            "prices": np.fromiter((row["price"] for row in rows), dtype=np.float64, count=len(rows)),
+            "categories": categories,
+            "counts": np.array(counts, dtype=np.int64),
+        }
+    except Exception as e:
+        logger.error(f"Error loading the price column: {e}")
+        return None
+
+
+def normalize_percentiles(percentiles: tuple) -> tuple:
+    """
+    Sort and deduplicate requested percentiles, so equivalent requests share
+    one cache entry.
+
+    Returns:
+        tuple: The distinct percentiles as floats, in increasing order.
+    """
+    return tuple(sorted({float(q) for q in percentiles}))
+
+
+def _sorted_percentiles(prices: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Linearly interpolated percentiles (as ``np.percentile``) of every sorted
+    slice ``prices[start:start + count]`` at once. ``q`` holds either the same
+    percentiles for every slice or one row of percentiles per slice.
+
+    Returns:
+        np.ndarray: One row per slice, one column per percentile.
+    """
+    last = (starts + counts - 1)[:, None]
+    position = starts[:, None] + (counts - 1)[:, None] * (q / 100.0)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, last)
+    return prices[low] + (prices[high] - prices[low]) * (position - low)
+
+
+def _histograms(prices: np.ndarray, counts: np.ndarray, bins: int) -> tuple:
+    """
+    Count the prices of every category slice in equal-width bins shared by
+    all categories, the last bin including its upper edge.
+
+    Returns:
+        tuple: The ``bins + 1`` edges and one histogram row per category.
+    """
+    edges = np.linspace(prices.min(), prices.max(), bins + 1)
+    codes = np.repeat(np.arange(counts.size), counts)
+    slots = np.clip(np.searchsorted(edges, prices, side="right") - 1, 0, bins - 1)
+    histograms = np.bincount(codes * bins + slots, minlength=counts.size * bins)
+    return edges, histograms.reshape(counts.size, bins)
+
+
+def _empty_distribution(bins: int, labels: list) -> dict:
+    """
+    Price distribution of a catalog without prices.
+
+    Returns:
+        dict: Zero counts and percentiles.
+    """
+    return {
+        "bins": bins,
+        "bin_edges": [0.0] * (bins + 1),
+        "overall": {"count": 0, "histogram": [0] * bins, "percentiles": dict.fromkeys(labels, 0.0)},
+        "categories": [],
+    }
+
+
+@normalize_args(percentiles=normalize_percentiles)
+@cache_with_stats
+def get_price_distribution(bins: int = 10, percentiles: tuple = DEFAULT_PERCENTILES) -> dict:
+    """
+    Compute price histograms and percentiles for the whole catalog and for
+    every category, vectorized over the cached price column. All histograms
+    share the same equal-width bins between the lowest and highest price, the
+    last bin including its upper edge.
+
+    Args:
+        bins: Number of histogram bins.
+        percentiles: Percentiles to report, between 0 and 100.
+
+    Returns:
+        dict: A dictionary containing:
+            - bins: The number of bins.
+            - bin_edges: The ``bins + 1`` bin edges.
+            - overall: Distribution of all prices.
+            - categories: Distribution per category, each with a name.
+        Every distribution has a count, a histogram (books per bin) and a
+        mapping of percentile to price.
+    """
+    try:
+        logger.info(f"Computing price distribution with {bins} bins and percentiles {percentiles}.")
+        column = get_price_column()
+        prices, counts = column["prices"], column["counts"]
+        q = np.asarray(percentiles, dtype=np.float64)
+        labels = [f"{value:g}" for value in q]
+        if prices.size == 0:
+            return _empty_distribution(bins, labels)
+
+        edges, histograms = _histograms(prices, counts, bins)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        category_percentiles = _sorted_percentiles(prices, starts, counts, q)
+        overall_percentiles = np.percentile(prices, q)
+
+        distribution = {
+            "bins": bins,
+            "bin_edges": edges.tolist(),
+            "overall": {
+                "count": int(prices.size),
+                "histogram": histograms.sum(axis=0).tolist(),
+                "percentiles": dict(zip(labels, overall_percentiles.tolist())),
+            },
+            "categories": [
+                {
+                    "name": name,
+                    "count": count,
+                    "histogram": histogram,
+                    "percentiles": dict(zip(labels, values)),
+                }
+                for name, count, histogram, values in zip(
+                    column["categories"], counts.tolist(), histograms.tolist(), category_percentiles.tolist()
+                )
+            ],
+        }
+        logger.info(f"Computed price distribution over {prices.size} prices.")
+        return distribution
+    except Exception as e:
+        logger.error(f"Error computing price distribution: {e}")
+        return None
+
+
+def _crosstab_labels(values: set) -> tuple:
+    """
+    Order the distinct values of a cross-tab dimension, NULL last.
+
+    Returns:
+        tuple: The ordered values and their string labels.
+    """
+    ordered = sorted(values, key=lambda value: (value is None, value))
+    return ordered, ["" if value is None else str(value) for value in ordered]
+
+
+@cache_with_stats
+def get_crosstab(rows: str = "category", cols: str = "rating", metric: str = "count") -> dict:
+    """
+    Compute a matrix of a metric for every pair of values of two book
+    dimensions, with a single GROUP BY over the books table. Cached until
+    the catalog changes.
+
+    Args:
+        rows: Dimension of the matrix rows (a key of CROSSTAB_DIMENSIONS).
+        cols: Dimension of the matrix columns.
+        metric: "count" (books per cell) or "avg_price" (average price per cell).
+
+    Returns:
+        dict: A dictionary containing:
+            - rows, cols, metric: The requested dimensions and metric.
+            - row_labels: The values of the row dimension.
+            - col_labels: The values of the column dimension.
+            - values: One list per row label, one value per column label; empty
+              cells are 0 for counts and None for average prices.
+    """
+    try:
+        logger.info(f"Computing {metric} cross-tab of {rows} by {cols}.")
+        cells = manager.select(
+            f"""
+            SELECT {CROSSTAB_DIMENSIONS[rows]} AS row_value,
+                   {CROSSTAB_DIMENSIONS[cols]} AS col_value,
+                   {CROSSTAB_METRICS[metric]} AS value
+            FROM books
+            GROUP BY row_value, col_value
+        """
+        )
+        row_values, row_labels = _crosstab_labels({cell["row_value"] for cell in cells})
+        col_values, col_labels = _crosstab_labels({cell["col_value"] for cell in cells})
+        row_index = {value: i for i, value in enumerate(row_values)}
+        col_index = {value: i for i, value in enumerate(col_values)}
+        empty = 0 if metric == "count" else None
+        values = [[empty] * len(col_values) for _ in row_values]
+        for cell in cells:
+            values[row_index[cell["row_value"]]][col_index[cell["col_value"]]] = cell["value"]
+        logger.info(f"Computed a {len(row_values)}x{len(col_values)} cross-tab.")
+        return {
+            "rows": rows,
+            "cols": cols,
+            "metric": metric,
+            "row_labels": row_labels,
+            "col_labels": col_labels,
+            "values": values,
+        }
+    except Exception as e:
+        logger.error(f"Error computing cross-tab: {e}")
+        return None
+
+
+@cache_with_stats
+def get_sample() -> dict:
+    """
+    Load the uniform book sample maintained at ingest as NumPy columns,
+    sorted by category and then by price. NULL categories and availabilities
+    are read as "", NULL ratings as 0 and NULL prices as NaN. The population
+    and the rows are read in one transaction so they describe the same
+    catalog. Cached until the catalog changes.
+
+    Returns:
+        dict: A dictionary containing:
+            - population: Number of books in the catalog.
+            - size: Number of sampled books.
+            - categories, availability: String arrays.
+            - ratings: int64 array.
+            - prices: float64 array.
+    """
+    try:
+        logger.info("Loading the book sample.")
+        _ensure_aggregates()
+        with manager.transaction() as conn:
+            # sqlite3 does not open a transaction for SELECTs on its own.
+            conn.execute("BEGIN")
+            population = conn.execute("SELECT population FROM sample_meta").fetchone()[0]
+            rows = conn.execute(
+                """
+                SELECT COALESCE(b.category, '') AS category, COALESCE(b.rating, 0) AS rating,
+                       COALESCE(b.availability, '') AS availability, b.price AS price
+                FROM book_sample s JOIN books b ON b.id = s.book_id
+                ORDER BY b.category, b.price
+            """
+            ).fetchall()
+        return {
+            "population": population,
+            "size": len(rows),
+            "categories": np.array([row["category"] for row in rows], dtype=str),
+            "availability": np.array([row["availability"] for row in rows], dtype=str),
+            "ratings": np.array([row["rating"] for row in rows], dtype=np.int64),
+            "prices": np.array([row["price"] for row in rows], dtype=np.float64),
+        }
+    except Exception as e:
+        logger.error(f"Error loading the book sample: {e}")
+        return None
+
+
+def _estimate_counts(hits: np.ndarray, sample: dict) -> tuple:
+    """
+    Scale counts of sampled books to the catalog, with the margin of error of
+    each estimate at CONFIDENCE (normal approximation of the sampled share,
+    with finite population correction).
+
+    Returns:
+        tuple: The estimated counts and their margins, as float arrays.
+    """
+    hits = np.asarray(hits, dtype=np.float64)
+    size, population = sample["size"], sample["population"]
+    if size == 0:
+        return np.zeros_like(hits), np.zeros_like(hits)
+    share = hits / size
+    correction = max(1.0 - size / population, 0.0)
+    margins = Z_SCORE * population * np.sqrt(share * (1.0 - share) * correction / size)
+    return population * share, margins
+
+
+def _mean_margins(variances: np.ndarray, sizes: np.ndarray, sample: dict) -> list:
+    """
+    Margins of error at CONFIDENCE of sample means, given the sample variances
+    (ddof=1) and sizes of their groups. Groups of fewer than two prices have
+    no margin.
+
+    Returns:
+        list: One margin, or None, per group.
+    """
+    correction = max(1.0 - sample["size"] / sample["population"], 0.0) if sample["population"] else 0.0
+    sizes = np.asarray(sizes, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margins = Z_SCORE * np.sqrt(np.maximum(variances, 0.0) * correction / sizes)
+    return [float(margin) if size > 1 else None for margin, size in zip(margins, sizes)]
+
+
+def _group_prices(codes: np.ndarray, groups: int, prices: np.ndarray) -> tuple:
+    """
+    Per-group number, mean and sample variance (ddof=1) of the non-NaN prices.
+
+    Returns:
+        tuple: Three float arrays of length ``groups``.
+    """
+    priced = ~np.isnan(prices)
+    codes, prices = codes[priced], prices[priced]
+    sizes = np.bincount(codes, minlength=groups).astype(np.float64)
+    sums = np.bincount(codes, weights=prices, minlength=groups)
+    squares = np.bincount(codes, weights=prices * prices, minlength=groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / sizes
+        variances = (squares - sizes * means * means) / (sizes - 1)
+    return sizes, means, variances
+
+
+def _approximation(sample: dict, margins: dict) -> dict:
+    """
+    Describe how approximate stats were computed.
+
+    Returns:
+        dict: The sample size, catalog size, confidence level and margins.
+    """
+    return {
+        "sample_size": sample["size"],
+        "population": sample["population"],
+        "confidence": CONFIDENCE,
+        "margins": margins,
+    }
+
+
+@cache_with_stats
+def get_approx_overview_stats() -> dict:
+    """
+    Estimate the overview statistics from the book sample. The total is exact
+    (kept by the sampling triggers); min and max are those of the sample and
+    have no margin.
+
+    Returns:
+        dict: The fields of ``get_overview_stats`` plus an approximation with
+        the margins of the average price and of every rating count.
+    """
+    try:
+        logger.info("Estimating overview statistics from the book sample.")
+        sample = get_sample()
+        prices = sample["prices"][~np.isnan(sample["prices"])]
+        ratings, hits = np.unique(sample["ratings"], return_counts=True)
+        estimates, count_margins = _estimate_counts(hits, sample)
+        price_margin = _mean_margins(
+            np.array([prices.var(ddof=1) if prices.size > 1 else 0.0]), [prices.size], sample
+        )[0]
+        labels = [str(rating) for rating in ratings.tolist()]
+        return {
+            "total_books": sample["population"],
+            "average_price": float(prices.mean()) if prices.size else 0.0,
+            "min_price": float(prices.min()) if prices.size else 0.0,
+            "max_price": float(prices.max()) if prices.size else 0.0,
+            "stddev_price": float(prices.std()) if prices.size else 0.0,
+            "ratings_distribution": dict(zip(labels, np.rint(estimates).astype(int).tolist())),
+            "approximation": _approximation(
+                sample,
+                {
+                    "average_price": price_margin,
+                    "ratings_distribution": dict(zip(labels, count_margins.tolist())),
+                },
+            ),
+        }
+    except Exception as e:
+        logger.error(f"Error estimating overview statistics: {e}")
+        return None
+
+
+@cache_with_stats
+def get_approx_category_stats() -> dict:
+    """
+    Estimate the statistics by category from the book sample. Categories
+    without sampled books are left out.
+
+    Returns:
+        dict: The categories of ``get_category_stats`` plus an approximation
+        with the margins of every category total and average price.
+    """
+    try:
+        logger.info("Estimating category statistics from the book sample.")
+        sample = get_sample()
+        names, codes = np.unique(sample["categories"], return_inverse=True)
+        totals, total_margins = _estimate_counts(np.bincount(codes, minlength=names.size), sample)
+        sizes, means, variances = _group_prices(codes, names.size, sample["prices"])
+        price_margins = _mean_margins(variances, sizes, sample)
+        names = names.tolist()
+        return {
+            "categories": [
+                {
+                    "name": name,
+                    "total_books": int(round(total)),
+                    "average_price": float(mean) if size else 0.0,
+                }
+                for name, total, mean, size in zip(names, totals.tolist(), means.tolist(), sizes.tolist())
+            ],
+            "approximation": _approximation(
+                sample,
+                {
+                    "categories": [
+                        {"name": name, "total_books": total, "average_price": price}
+                        for name, total, price in zip(names, total_margins.tolist(), price_margins)
+                    ]
+                },
+            ),
+        }
+    except Exception as e:
+        logger.error(f"Error estimating category statistics: {e}")
+        return None
+
+
+def _percentile_margins(
+    prices: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: np.ndarray, estimates: np.ndarray, sample: dict
+) -> np.ndarray:
+    """
+    Margins of sample percentiles at CONFIDENCE, from the distribution-free
+    interval of ranks ``q ± z * sqrt(q (1 - q) / n)`` of every sorted slice.
+
+    Returns:
+        np.ndarray: One row per slice, one column per percentile.
+    """
+    correction = max(1.0 - sample["size"] / sample["population"], 0.0)
+    share = q[None, :] / 100.0
+    spread = 100.0 * Z_SCORE * np.sqrt(share * (1.0 - share) * correction / counts[:, None])
+    low = _sorted_percentiles(prices, starts, counts, np.clip(q - spread, 0.0, 100.0))
+    high = _sorted_percentiles(prices, starts, counts, np.clip(q + spread, 0.0, 100.0))
+    return np.maximum(estimates - low, high - estimates)
+
+
+@normalize_args(percentiles=normalize_percentiles)
+@cache_with_stats
+def get_approx_price_distribution(bins: int = 10, percentiles: tuple = DEFAULT_PERCENTILES) -> dict:
+    """
+    Estimate price histograms and percentiles from the book sample. Bin counts
+    and category counts are scaled to the catalog; the bins span the sampled
+    prices.
+
+    Args:
+        bins: Number of histogram bins.
+        percentiles: Percentiles to report, between 0 and 100.
+
+    Returns:
+        dict: The fields of ``get_price_distribution`` plus an approximation
+        with the margins of every count, bin and percentile.
+    """
+    try:
+        logger.info(f"Estimating price distribution with {bins} bins from the book sample.")
+        sample = get_sample()
+        priced = ~np.isnan(sample["prices"])
+        prices = sample["prices"][priced]
+        names, counts = np.unique(sample["categories"][priced], return_counts=True)
+        q = np.asarray(percentiles, dtype=np.float64)
+        labels = [f"{value:g}" for value in q]
+        if prices.size == 0:
+            return _empty_distribution(bins, labels)
+
+        edges, histograms = _histograms(prices, counts, bins)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        category_percentiles = _sorted_percentiles(prices, starts, counts, q)
+        category_percentile_margins = _percentile_margins(
+            prices, starts, counts, q, category_percentiles, sample
+        )
+        ordered = np.sort(prices)
+        whole = (np.array([0]), np.array([prices.size]))
+        overall_percentiles = _sorted_percentiles(ordered, *whole, q)
+        overall_percentile_margins = _percentile_margins(ordered, *whole, q, overall_percentiles, sample)
+
+        totals, total_margins = _estimate_counts(counts, sample)
+        bin_totals, bin_margins = _estimate_counts(histograms, sample)
+        overall_total, overall_margin = _estimate_counts(np.array([prices.size]), sample)
+        overall_bins, overall_bin_margins = _estimate_counts(histograms.sum(axis=0), sample)
+        names = names.tolist()
+
+        def rounded(values: np.ndarray) -> list:
+            return np.rint(values).astype(int).tolist()
+
+        return {
+            "bins": bins,
+            "bin_edges": edges.tolist(),
+            "overall": {
+                "count": rounded(overall_total)[0],
+                "histogram": rounded(overall_bins),
+                "percentiles": dict(zip(labels, overall_percentiles[0].tolist())),
+            },
+            "categories": [
+                {
+                    "name": name,
+                    "count": count,
+                    "histogram": histogram,
+                    "percentiles": dict(zip(labels, values)),
+                }
+                for name, count, histogram, values in zip(
+                    names, rounded(totals), rounded(bin_totals), category_percentiles.tolist()
+                )
+            ],
+            "approximation": _approximation(
+                sample,
+                {
+                    "overall": {
+                        "count": overall_margin[0],
+                        "histogram": overall_bin_margins.tolist(),
+                        "percentiles": dict(zip(labels, overall_percentile_margins[0].tolist())),
+                    },
+                    "categories": [
+                        {
+                            "name": name,
+                            "count": count,
+                            "histogram": histogram,
+                            "percentiles": dict(zip(labels, values)),
+                        }
+                        for name, count, histogram, values in zip(
+                            names,
+                            total_margins.tolist(),
+                            bin_margins.tolist(),
+                            category_percentile_margins.tolist(),
+                        )
+                    ],
+                },
+            ),
+        }
+    except Exception as e:
+        logger.error(f"Error estimating price distribution: {e}")
+        return None
+
+
+@cache_with_stats
+def get_approx_crosstab(rows: str = "category", cols: str = "rating", metric: str = "count") -> dict:
+    """
+    Estimate a cross-tab from the book sample. Counts are scaled to the
+    catalog; combinations without sampled books are 0 (counts) or None
+    (average prices).
+
+    Args:
+        rows: Dimension of the matrix rows (a key of CROSSTAB_DIMENSIONS).
+        cols: Dimension of the matrix columns.
+        metric: "count" or "avg_price".
+
+    Returns:
+        dict: The fields of ``get_crosstab`` plus an approximation with a
+        matrix of margins.
+    """
+    try:
+        logger.info(f"Estimating {metric} cross-tab of {rows} by {cols} from the book sample.")
+        sample = get_sample()
+        columns = {"category": "categories", "rating": "ratings", "availability": "availability"}
+        row_values, row_codes = np.unique(sample[columns[rows]], return_inverse=True)
+        col_values, col_codes = np.unique(sample[columns[cols]], return_inverse=True)
+        shape = (row_values.size, col_values.size)
+        cells = row_codes * shape[1] + col_codes
+        if metric == "count":
+            estimates, margins = _estimate_counts(np.bincount(cells, minlength=shape[0] * shape[1]), sample)
+            values = np.rint(estimates).astype(int).reshape(shape).tolist()
+            margins = margins.reshape(shape).tolist()
+        else:
+            sizes, means, variances = _group_prices(cells, shape[0] * shape[1], sample["prices"])
+            flat_margins = _mean_margins(variances, sizes, sample)
+            values = [
+                [float(means[i]) if sizes[i] else None for i in range(r * shape[1], (r + 1) * shape[1])]
+                for r in range(shape[0])
+            ]
+            margins = [flat_margins[r * shape[1]:(r + 1) * shape[1]] for r in range(shape[0])]
+        return {
+            "rows": rows,
+            "cols": cols,
+            "metric": metric,
+            "row_labels": [str(value) for value in row_values.tolist()],
+            "col_labels": [str(value) for value in col_values.tolist()],
+            "values": values,
+            "approximation": _approximation(sample, {"values": margins}),
+        }
+    except Exception as e:
+        logger.error(f"Error estimating cross-tab: {e}")
+        return None
@@ -1,116 +1,618 @@
-from cachetools import TTLCache, cached
+from src.api.utils.cache_backends import (
+    CacheBackend,
+    MemoryBackend,
+    MemoryBudget,
+    create_backend,
+)
+from utils.catalog import CatalogVersionWatcher
+from utils.database_manager import DatabaseManager
 from cachetools.keys import hashkey
+from logging import getLogger, basicConfig, INFO
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from threading import Event, Lock
+from operator import attrgetter, itemgetter
+from functools import wraps
+from inspect import signature
+from math import ceil, floor
+from collections import OrderedDict
+from typing import Any, Optional
+from pathlib import Path
+from json import dumps
+import asyncio
+from src.api.config import (
+    CACHE_SAFETY_TTL,
+    CACHE_BACKEND,
+    CACHE_SQLITE_PATH,
+    CACHE_REDIS_URL,
+    CACHE_MEMORY_BUDGET_MB,
+    CACHE_L2_PATH,
+    CACHE_L2_CACHES,
+    CACHE_SINGLE_FLIGHT_TIMEOUT,
+    CACHE_REFRESH_WORKERS,
+)
 
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DB_PATH = Path(__file__).resolve().parents[3] / "tmp" / "bookonthetable.db"
+catalog_watcher = CatalogVersionWatcher(DatabaseManager(str(DB_PATH)).db_path)
+# Bump when the shape of cached values changes, so persistent and shared
+# caches written by an older release are not read back.
+CACHE_FORMAT_VERSION = 3
+memory_budget = MemoryBudget(int(CACHE_MEMORY_BUDGET_MB * 1024 * 1024))
 
-stats_cache = TTLCache(maxsize=100, ttl=600)
 
-logs_cache = TTLCache(maxsize=100, ttl=600)
+def _backend(name: str, maxsize: int, ttl: float) -> CacheBackend:
+    """
+    Create the configured backend (CACHE_BACKEND) for a named cache.
+    Memory backends share the process-wide byte budget (CACHE_MEMORY_BUDGET_MB);
+    those listed in CACHE_L2_CACHES are backed by the on-disk L2 at CACHE_L2_PATH.
+    Args:
+        name (str): The cache name.
+        maxsize (int): Maximum number of entries.
+        ttl (float): Entry lifetime in seconds.
+    Returns:
+        CacheBackend: The backend instance.
+    """
+    return create_backend(
+        name,
+        maxsize,
+        ttl,
+        CACHE_BACKEND,
+        CACHE_SQLITE_PATH,
+        CACHE_REDIS_URL,
+        memory_budget,
+        l2_path=CACHE_L2_PATH if name in CACHE_L2_CACHES else None,
+    )
+
+
+stats_cache = _backend("stats_cache", maxsize=100, ttl=CACHE_SAFETY_TTL)
+
+logs_cache = _backend("logs_cache", maxsize=100, ttl=600)
+
+book_id_cache = _backend("book_id_cache", maxsize=500, ttl=CACHE_SAFETY_TTL)
+books_cache = _backend("books_cache", maxsize=500, ttl=CACHE_SAFETY_TTL)
+search_books_cache = _backend("search_books_cache", maxsize=500, ttl=CACHE_SAFETY_TTL)
+top_rated_books_cache = _backend("top_rated_books_cache", maxsize=100, ttl=CACHE_SAFETY_TTL)
+price_range_books_cache = _backend("price_range_books_cache", maxsize=500, ttl=CACHE_SAFETY_TTL)
+similar_books_cache = _backend("similar_books_cache", maxsize=1000, ttl=CACHE_SAFETY_TTL)
+book_history_cache = _backend("book_history_cache", maxsize=1000, ttl=CACHE_SAFETY_TTL)
+
+ml_features_cache = _backend("ml_features_cache", maxsize=1000, ttl=CACHE_SAFETY_TTL)
+ml_training_data_cache = _backend("ml_training_data_cache", maxsize=1000, ttl=CACHE_SAFETY_TTL)
+ml_predict_cache = _backend("ml_predict_cache", maxsize=100_000, ttl=600)
+
+compressed_responses_cache = MemoryBackend(
+    "compressed_responses_cache", maxsize=10_000, ttl=600, budget=memory_budget
+)
+http_responses_cache = MemoryBackend(
+    "http_responses_cache", maxsize=2000, ttl=CACHE_SAFETY_TTL, budget=memory_budget
+)
+
+CATALOG_CACHES = [
+    stats_cache,
+    book_id_cache,
+    books_cache,
+    search_books_cache,
+    top_rated_books_cache,
+    price_range_books_cache,
+    similar_books_cache,
+    book_history_cache,
+    ml_features_cache,
+    ml_training_data_cache,
+    http_responses_cache,
+]
+
+ALL_CACHES = CATALOG_CACHES + [logs_cache, ml_predict_cache, compressed_responses_cache]
+
+_known_version = None
+_version_lock = Lock()
+
+refresh_executor = ThreadPoolExecutor(
+    max_workers=CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+)
+_refreshing = set()
+_refreshing_lock = Lock()
+
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+
+def current_catalog_version() -> int:
+    """
+    Return the current catalog version, invalidating every catalog-derived
+    cache the first time a new version is observed.
+    Returns:
+        int: The current catalog version.
+    """
+    global _known_version
+    version = catalog_watcher.current()
+    if version != _known_version:
+        with _version_lock:
+            if version != _known_version:
+                for cache in CATALOG_CACHES:
+                    cache.invalidate(version)
+                _known_version = version
+    return version
+
+
+def catalog_key(*args, **kwargs) -> tuple:
+    """
+    Build a cache key prefixed with the cached value format and the current
+    catalog version, so results computed for an older catalog, or stored in
+    a shared or on-disk cache by a release with another format, are never
+    served.
+    Returns:
+        tuple: The hashable cache key.
+    """
+    return hashkey(CACHE_FORMAT_VERSION, current_catalog_version(), *args, **kwargs)
+
+
+def cache_stats() -> list:
+    """
+    Snapshot the metrics of every cache.
+    Returns:
+        list: One dictionary of metrics per cache.
+    """
+    return [cache.stats() for cache in ALL_CACHES]
+
+
+def log_cache_stats() -> None:
+    """
+    Log one JSON line per cache with its current metrics, then one with the
+    usage of the shared memory budget.
+    """
+    for stats in cache_stats():
+        logger.info(f"cache_stats {dumps(stats)}")
+    logger.info(f"cache_memory {dumps(memory_budget.stats())}")
+
+
+async def report_cache_stats(interval: float) -> None:
+    """
+    Log cache metrics every ``interval`` seconds until cancelled.
+    Args:
+        interval (float): Seconds between two snapshots.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(log_cache_stats)
+        except Exception as e:
+            logger.error(f"Error logging cache stats: {e}")
+
+
+class _Flight:
+    """A computation in progress that other callers can wait for."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent computations of the same key: the first caller
+    computes while the others wait for its result instead of computing it
+    again. Waiters that time out compute the value themselves.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = Lock()
+        self._flights = {}
+
+    def run(self, key: Any, compute: callable, cache: CacheBackend) -> Any:
+        """
+        Return the result of ``compute`` for ``key``, sharing it with any
+        concurrent caller asking for the same key.
+        Args:
+            key (Any): Identifies the computation.
+            compute (callable): Zero-argument function producing the value.
+            cache (CacheBackend): Backend whose coalescing metrics are updated.
+        Returns:
+            Any: The computed value.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if leader:
+            try:
+                flight.value = compute()
+                return flight.value
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+
+        if not flight.done.wait(self.timeout):
+            cache.record_coalesce_timeout()
+            return compute()
+        cache.record_coalesced()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+
+single_flight = SingleFlight(CACHE_SINGLE_FLIGHT_TIMEOUT)
+
+
+def cached_in(cache: CacheBackend, key: callable = hashkey, stale_key: callable = None) -> callable:
+    """
+    Build a decorator memoizing a function in a cache backend.
+    Keys are prefixed with the function's qualified name, so several functions
+    can share one cache. Concurrent misses for the same key are coalesced so
+    only one caller runs the function. Hits, misses, coalesced callers and the
+    time spent filling misses are recorded on the backend.
+    With ``stale_key``, which builds a key that does not include the catalog
+    version, the last value seen for each such key is remembered (up to the
+    cache's maxsize). When the versioned key misses, because the catalog
+    changed or the entry expired, that value is served at once while the new
+    one is computed in a background thread (stale-while-revalidate).
+    None results signal a failure in the services and are not cached, and
+    neither are results whose computation or background refresh spanned a
+    catalog version change, so they cannot be stored after the invalidation.
+    Args:
+        cache (CacheBackend): The backend storing the results.
+        key (callable): Builds the cache key from the call arguments.
+        stale_key (callable): Builds the version-independent key of the
+            value served while a missing entry is recomputed.
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func: callable) -> callable:
+        qualname = f"{func.__module__}.{func.__qualname__}"
+        last_values = OrderedDict()
+        last_values_lock = Lock()
+
+        def remember(args, kwargs, value):
+            if stale_key is None:
+                return
+            last_key = stale_key(*args, **kwargs)
+            with last_values_lock:
+                last_values[last_key] = value
+                last_values.move_to_end(last_key)
+                if len(last_values) > cache.maxsize:
+                    last_values.popitem(last=False)
 
-book_id_cache = TTLCache(maxsize=500, ttl=600)
-books_cache = TTLCache(maxsize=500, ttl=600)
-search_books_cache = TTLCache(maxsize=500, ttl=600)
-top_rated_books_cache = TTLCache(maxsize=100, ttl=600)
-price_range_books_cache = TTLCache(maxsize=500, ttl=600)
+        def compute(cache_key, args, kwargs):
+            version = current_catalog_version()
+            start = perf_counter()
+            value = func(*args, **kwargs)
+            cache.record_fill(perf_counter() - start)
+            if value is not None:
+                with _version_lock:
+                    if catalog_watcher.current() == version == _known_version:
+                        cache.set(cache_key, value)
+                remember(args, kwargs, value)
+            return value
+
+        def refresh(cache_key, args, kwargs):
+            flight_key = (cache.name, cache_key)
+            try:
+                value = single_flight.run(
+                    flight_key, lambda: compute(cache_key, args, kwargs), cache
+                )
+                cache.record_refresh(value is not None)
+            except Exception as e:
+                cache.record_refresh(False)
+                logger.error(f"Error refreshing {cache.name} entry: {e}")
+            finally:
+                with _refreshing_lock:
+                    _refreshing.discard(flight_key)
+
+        def schedule_refresh(cache_key, args, kwargs):
+            flight_key = (cache.name, cache_key)
+            with _refreshing_lock:
+                if flight_key in _refreshing:
+                    return
+                _refreshing.add(flight_key)
+            refresh_executor.submit(refresh, cache_key, args, kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = (qualname, key(*args, **kwargs))
+            try:
+                value = cache.get(cache_key)
+                cache.record_hit()
+                if stale_key is not None:
+                    remember(args, kwargs, value)
+                return value
+            except KeyError:
+                cache.record_miss()
+
+            if stale_key is not None:
+                with last_values_lock:
+                    stale = last_values.get(stale_key(*args, **kwargs))
+                if stale is not None:
+                    cache.record_stale_hit()
+                    schedule_refresh(cache_key, args, kwargs)
+                    return stale
+
+            def fill():
+                try:
+                    return cache.get(cache_key)
+                except KeyError:
+                    return compute(cache_key, args, kwargs)
+
+            return single_flight.run((cache.name, cache_key), fill, cache)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cached_items_in(cache: CacheBackend, keys: callable) -> callable:
+    """
+    Build a decorator memoizing a batch function item by item. The decorated
+    function takes a list of items and returns one result per item, in order.
+    Each call looks the distinct items up in the cache in bulk, runs the
+    function once on the missing ones only, stores their results and
+    reassembles the full list in the original order. Hits and misses are
+    counted per item; misses are not coalesced across concurrent calls.
+    Item keys are not prefixed with the function name, so the cache must be
+    dedicated to one function.
+    None results signal a failure in the services and are not cached.
+    Args:
+        cache (CacheBackend): The backend storing the per-item results.
+        keys (callable): Builds the list of item keys of a batch.
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func: callable) -> callable:
+
+        @wraps(func)
+        def wrapper(items: list) -> list:
+            item_keys = keys(items)
+            distinct = dict.fromkeys(item_keys)
+            found = cache.get_many(list(distinct))
+            pending = {}
+            missed = 0
+            if len(found) < len(distinct):
+                for item_key, item in zip(item_keys, items):
+                    if item_key not in found:
+                        pending.setdefault(item_key, item)
+                        missed += 1
+            cache.record_hit(len(item_keys) - missed)
+            if pending:
+                cache.record_miss(missed)
+                start = perf_counter()
+                values = func(list(pending.values()))
+                cache.record_fill(perf_counter() - start)
+                if values is None:
+                    return None
+                computed = dict(zip(pending, values))
+                cache.set_many(computed)
+                found.update(computed)
+            return list(map(found.__getitem__, item_keys))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def normalize_text(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a free-text filter: trimmed and lower-cased (as the queries
+    compare with LOWER), with empty strings treated as no filter.
+    Args:
+        value (Optional[str]): The raw filter.
+    Returns:
+        Optional[str]: The normalized filter, or None.
+    """
+    if value is None:
+        return None
+    value = value.strip().lower()
+    return value or None
+
+
+def normalize_min_price(value: float) -> float:
+    """
+    Round a lower price bound up to the cent. Prices are stored in cents, so
+    the bound selects exactly the same books.
+    Args:
+        value (float): The raw lower bound.
+    Returns:
+        float: The bound rounded up to two decimals.
+    """
+    return ceil(round(float(value) * 100, 6)) / 100
+
+
+def normalize_max_price(value: float) -> float:
+    """
+    Round an upper price bound down to the cent, selecting exactly the same books.
+    Args:
+        value (float): The raw upper bound.
+    Returns:
+        float: The bound rounded down to two decimals.
+    """
+    return floor(round(float(value) * 100, 6)) / 100
+
+
+def normalize_args(**normalizers: callable) -> callable:
+    """
+    Build a decorator rewriting selected arguments before the call, so that
+    equivalent requests share one cache entry. Apply it above a
+    ``cache_with_*`` decorator; the normalized arguments are used both for the
+    cache key and for the call itself. Calls whose key changed are counted as
+    "normalized" in the cache metrics.
+    Args:
+        normalizers (callable): Normalizer per parameter name.
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func: callable) -> callable:
+        parameters = signature(func)
+        cache = getattr(func, "cache", None)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = parameters.bind(*args, **kwargs)
+            bound.apply_defaults()
+            changed = False
+            for name, normalizer in normalizers.items():
+                value = normalizer(bound.arguments[name])
+                changed = changed or value != bound.arguments[name]
+                bound.arguments[name] = value
+            if changed and cache is not None:
+                cache.record_normalized()
+            return func(*bound.args, **bound.kwargs)
+
+        return wrapper
+
+    return decorator
 
-ml_features_cache = TTLCache(maxsize=1000, ttl=600)
-ml_training_data_cache = TTLCache(maxsize=1000, ttl=600)
-ml_predict_cache = TTLCache(maxsize=1000, ttl=600)
 
 def cache_with_stats(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for statistics.
-    This uses a cache with a maximum size of 100 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for statistics.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    after a catalog change the previous value is served while the new one is
+    computed in the background. The cache holds up to 100 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=stats_cache)(func)
+    return cached_in(
+        stats_cache, key=catalog_key, stale_key=hashkey
+    )(func)
 
 def cache_with_books(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for books.
-    This uses a cache with a maximum size of 500 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for books.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 500 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=books_cache)(func)
+    return cached_in(books_cache, key=catalog_key)(func)
 
 def cache_with_books_id(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for book IDs.
-    This uses a cache with a maximum size of 500 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for book IDs.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 500 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=book_id_cache)(func)
+    return cached_in(book_id_cache, key=catalog_key)(func)
 
 def cache_with_search_books(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for search books.
-    This uses a cache with a maximum size of 500 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for search books.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 500 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=search_books_cache)(func)
+    return cached_in(search_books_cache, key=catalog_key)(func)
 
 def cache_with_top_rated_books(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for top-rated books.
-    This uses a cache with a maximum size of 100 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for top-rated books.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 100 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=top_rated_books_cache)(func)
+    return cached_in(top_rated_books_cache, key=catalog_key)(func)
 
 def cache_with_price_range_books(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for price range books.
-    This uses a cache with a maximum size of 500 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for price range books.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 500 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=price_range_books_cache)(func)
+    return cached_in(price_range_books_cache, key=catalog_key)(func)
+
+def cache_with_similar_books(func) -> callable:
+    """
+    Decorator to cache the result of a function for similar books.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 1000 entries.
+    Args:
+        func (callable): The function to be cached.
+    Returns:
+        callable: The cached version of the function.
+    """
+    return cached_in(similar_books_cache, key=catalog_key)(func)
+
+def cache_with_book_history(func) -> callable:
+    """
+    Decorator to cache the result of a function for book price histories.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    the TTL is only a safety net. The cache holds up to 1000 entries.
+    Args:
+        func (callable): The function to be cached.
+    Returns:
+        callable: The cached version of the function.
+    """
+    return cached_in(book_history_cache, key=catalog_key)(func)
 
 def cache_with_ml_features(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for ML features.
-    This uses a cache with a maximum size of 1000 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for ML features.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    after a catalog change the previous value is served while the new one is
+    computed in the background. The cache holds up to 1000 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=ml_features_cache)(func)
+    return cached_in(
+        ml_features_cache, key=catalog_key, stale_key=hashkey
+    )(func)
 
 def cache_with_ml_training_data(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for ML training data.
-    This uses a cache with a maximum size of 1000 and a TTL of 600 seconds.
+    Decorator to cache the result of a function for ML training data.
+    Entries are keyed on the catalog version and kept until the catalog changes;
+    after a catalog change the previous value is served while the new one is
+    computed in the background. The cache holds up to 1000 entries.
     Args:
         func (callable): The function to be cached.
     Returns:
         callable: The cached version of the function.
     """
-    return cached(cache=ml_training_data_cache)(func)
+    return cached_in(
+        ml_training_data_cache, key=catalog_key, stale_key=hashkey
+    )(func)
 
 
 def cache_with_predict(func) -> callable:
     """
-    Decorator to cache the result of a function with a TTLCache for predictions.
-    This uses a cache with a maximum size of 1000 and a TTL of 600 seconds.
+    Decorator to cache the predictions of a batch function item by item.
+    Each (price, category) pair is cached on its own, so batches sharing items
+    reuse each other's results and only unseen items are evaluated.
+    This uses a cache with a maximum size of 100000 items and a TTL of 600 seconds.
+    Predictions only depend on their input, so they are not tied to the catalog.
     """
-    def key(features):
-        return hashkey(tuple((f["price"], f["category"]) if isinstance(f, dict) else (f.price, f.category) for f in features))
-    
-    return cached(cache=ml_predict_cache, key=key)(func)
\ No newline at end of file
+    def keys(features):
+        if features and isinstance(features[0], dict):
+            return list(map(itemgetter("price", "category"), features))
+        return list(map(attrgetter("price", "category"), features))
+
+    return cached_items_in(ml_predict_cache, keys=keys)(func)
@@ -0,0 +1,918 @@
+from collections import OrderedDict
+from threading import Lock, local
+from time import perf_counter, time
+from types import MappingProxyType
+from fnmatch import fnmatchcase
+from sys import getsizeof
+from hashlib import blake2b
+from pathlib import Path
+from array import array
+from typing import Any
+import numpy as np
+import sqlite3
+import stat
+import os
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+VERSION_MARKER = "__catalog_version__"
+PRUNE_EVERY = 100
+
+EXT_TUPLE = 1
+EXT_ARRAY = 2
+EXT_NDARRAY = 3
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory held by a value, following containers and
+    counting shared objects once.
+    Args:
+        value (Any): The object to measure.
+    Returns:
+        int: The estimated size in bytes.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+def _encode_ext(value: Any) -> Any:
+    """
+    Encode the non-JSON types cached values are made of as MessagePack
+    extension types: tuples, ``array`` ID lists and NumPy arrays of a plain
+    dtype. Read-only mappings become dicts and NumPy scalars Python numbers.
+    Raises:
+        TypeError: For any other type, so arbitrary objects are never stored.
+    """
+    if isinstance(value, tuple):
+        return msgpack.ExtType(EXT_TUPLE, encode_value(list(value)))
+    if isinstance(value, array):
+        return msgpack.ExtType(EXT_ARRAY, value.typecode.encode("ascii") + value.tobytes())
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        header = [value.dtype.str, list(value.shape)]
+        return msgpack.ExtType(
+            EXT_NDARRAY, encode_value(header) + np.ascontiguousarray(value).tobytes()
+        )
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """Decode the extension types written by ``_encode_ext``."""
+    if code == EXT_TUPLE:
+        return tuple(decode_value(data))
+    if code == EXT_ARRAY:
+        values = array(data[:1].decode("ascii"))
+        values.frombytes(data[1:])
+        return values
+    if code == EXT_NDARRAY:
+        unpacker = msgpack.Unpacker(ext_hook=_decode_ext, strict_map_key=False)
+        unpacker.feed(data)
+        dtype, shape = unpacker.unpack()
+        body = data[unpacker.tell():]
+        return np.frombuffer(body, dtype=np.dtype(dtype)).reshape(shape).copy()
+    raise ValueError(f"Unknown cache extension type {code}")
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialize a cached value as MessagePack. Unlike pickle, decoding it can
+    only ever build plain data, so a tampered store cannot run code.
+    Args:
+        value (Any): JSON-like data, possibly holding tuples, ``array`` ID
+            lists and NumPy arrays.
+    Returns:
+        bytes: The encoded value.
+    Raises:
+        TypeError: If the value holds a type that cannot be encoded.
+    """
+    return msgpack.packb(value, use_bin_type=True, strict_types=True, default=_encode_ext)
+
+
+def decode_value(data: bytes) -> Any:
+    """
+    Deserialize a value written by ``encode_value``.
+    Args:
+        data (bytes): The encoded value.
+    Returns:
+        Any: The decoded value.
+    Raises:
+        ValueError: If the data is not a valid encoded value.
+    """
+    try:
+        return msgpack.unpackb(
+            data, raw=False, ext_hook=_decode_ext, strict_map_key=False
+        )
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Invalid cached value: {e}") from e
+
+
+def ensure_private_path(path: str) -> None:
+    """
+    Make sure a cache file lives in a directory only the current user can
+    write to, creating the directory (mode 700) and the file (mode 600) if
+    needed. Shared locations such as /tmp are refused, since anyone able to
+    create the file first could feed the process forged entries.
+    Args:
+        path (str): The cache database file.
+    Raises:
+        PermissionError: If the directory or the file is owned by another
+            user or writable by group or others.
+    """
+    target = Path(path).expanduser()
+    target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    uid = os.getuid()
+    for candidate in (target.parent, target):
+        try:
+            info = candidate.lstat()
+        except FileNotFoundError:
+            continue
+        if stat.S_ISLNK(info.st_mode) or info.st_uid != uid:
+            raise PermissionError(f"Cache path {candidate} is not owned by the current user")
+        if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"Cache path {candidate} is writable by other users")
+    os.close(os.open(target, os.O_CREAT | os.O_WRONLY | os.O_NOFOLLOW, 0o600))
+
+
+class CacheBackend:
+    """
+    Interface of the stores behind the ``cache_with_*`` decorators.
+    Backends map hashable keys to values and evict entries on their own
+    according to ``maxsize`` and ``ttl``. Hit, miss and fill metrics are
+    recorded by the decorators through the ``record_*`` methods.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._counters_lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._fills = 0
+        self._fill_seconds = 0.0
+        self._max_fill_seconds = 0.0
+        self._coalesced = 0
+        self._coalesce_timeouts = 0
+        self._stale_hits = 0
+        self._normalized = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    def get(self, key: Any) -> Any:
+        """
+        Return the value stored for a key.
+        Raises:
+            KeyError: If the key is missing or expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value for a key."""
+        raise NotImplementedError
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Look up several keys at once.
+        Args:
+            keys (list): The keys to look up.
+        Returns:
+            dict: The values of the keys found; missing or expired keys are left out.
+        """
+        found = {}
+        for key in keys:
+            try:
+                found[key] = self.get(key)
+            except KeyError:
+                pass
+        return found
+
+    def set_many(self, values: dict) -> None:
+        """Store several key/value pairs."""
+        for key, value in values.items():
+            self.set(key, value)
+
+    def clear(self) -> None:
+        """Remove every entry of this cache."""
+        raise NotImplementedError
+
+    def invalidate(self, version: int) -> None:
+        """
+        Drop every entry stored under a catalog version other than ``version``.
+        Args:
+            version (int): The current catalog version.
+        """
+        raise NotImplementedError
+
+    def record_hit(self, count: int = 1) -> None:
+        """Count lookups served from the cache."""
+        with self._counters_lock:
+            self._hits += count
+
+    def record_miss(self, count: int = 1) -> None:
+        """Count lookups that had to compute their value."""
+        with self._counters_lock:
+            self._misses += count
+
+    def record_fill(self, seconds: float) -> None:
+        """Record how long computing a missing value took."""
+        with self._counters_lock:
+            self._fills += 1
+            self._fill_seconds += seconds
+            self._max_fill_seconds = max(self._max_fill_seconds, seconds)
+
+    def record_coalesced(self) -> None:
+        """Count a miss served by waiting on another caller's computation."""
+        with self._counters_lock:
+            self._coalesced += 1
+
+    def record_coalesce_timeout(self) -> None:
+        """Count a caller that stopped waiting and computed the value itself."""
+        with self._counters_lock:
+            self._coalesce_timeouts += 1
+
+    def record_normalized(self) -> None:
+        """Count a call whose arguments were rewritten by key normalization."""
+        with self._counters_lock:
+            self._normalized += 1
+
+    def record_stale_hit(self) -> None:
+        """Count a hit served past its soft TTL while a refresh runs."""
+        with self._counters_lock:
+            self._stale_hits += 1
+
+    def record_refresh(self, succeeded: bool) -> None:
+        """Count a background refresh of a stale entry."""
+        with self._counters_lock:
+            self._refreshes += 1
+            if not succeeded:
+                self._refresh_errors += 1
+
+    def storage_stats(self) -> dict:
+        """
+        Return the metrics only the store itself knows about. Values a
+        backend cannot measure are reported as None.
+        Returns:
+            dict: ``evictions``, ``expired`` and ``approx_bytes``.
+        """
+        return {"evictions": None, "expired": None, "approx_bytes": None}
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the cache metrics.
+        Returns:
+            dict: Configuration, usage counters and storage metrics.
+        """
+        with self._counters_lock:
+            lookups = self._hits + self._misses
+            counters = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                "fills": self._fills,
+                "avg_fill_ms": (
+                    round(self._fill_seconds / self._fills * 1000, 3) if self._fills else None
+                ),
+                "max_fill_ms": round(self._max_fill_seconds * 1000, 3),
+                "coalesced": self._coalesced,
+                "coalesce_timeouts": self._coalesce_timeouts,
+                "normalized": self._normalized,
+                "stale_hits": self._stale_hits,
+                "refreshes": self._refreshes,
+                "refresh_errors": self._refresh_errors,
+            }
+        return {
+            "name": self.name,
+            "backend": type(self).__name__,
+            "entries": len(self),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            **counters,
+            **self.storage_stats(),
+        }
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryBudget:
+    """
+    Byte budget shared by every memory backend of the process.
+    Entries are charged with their estimated size and kept in one global
+    least-recently-used order, so when the budget is exceeded the coldest
+    entries are evicted whichever cache they belong to.
+    Memory backends guard their entries with the budget's ``lock``, and every
+    method but ``stats`` must be called with it held, so an entry and the size
+    charged for it always change together.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.lock = Lock()
+        self._entries = OrderedDict()
+        self._used = 0
+        self._evictions = 0
+        self._rejected = 0
+
+    def touch(self, backend: "MemoryBackend", key: Any) -> None:
+        """Mark an entry as recently used."""
+        if (backend, key) in self._entries:
+            self._entries.move_to_end((backend, key))
+
+    def charge(self, backend: "MemoryBackend", key: Any, size: int) -> bool:
+        """
+        Account for a new or replaced entry and evict the least recently used
+        entries of any backend until the total fits within the budget.
+        Args:
+            backend (MemoryBackend): The backend storing the entry.
+            key (Any): The entry key.
+            size (int): The estimated size of the entry in bytes.
+        Returns:
+            bool: False if the entry alone exceeds the budget and must not be
+            stored; the previous entry for the key is then dropped.
+        """
+        previous = self._entries.pop((backend, key), None)
+        if previous is not None:
+            self._used -= previous
+        if size > self.max_bytes:
+            self._rejected += 1
+            backend._evict(key)
+            return False
+        self._entries[(backend, key)] = size
+        self._used += size
+        while self._used > self.max_bytes:
+            (victim_backend, victim), victim_size = self._entries.popitem(last=False)
+            self._used -= victim_size
+            self._evictions += 1
+            victim_backend._evict(victim)
+        return True
+
+    def release(self, backend: "MemoryBackend", key: Any) -> None:
+        """Stop accounting for an entry removed by its backend."""
+        size = self._entries.pop((backend, key), None)
+        if size is not None:
+            self._used -= size
+
+    def stats(self) -> dict:
+        """
+        Snapshot the budget usage.
+        Returns:
+            dict: The budget, the bytes in use, the number of entries evicted
+            to stay within it and of entries too large to be cached.
+        """
+        with self.lock:
+            return {
+                "budget_bytes": self.max_bytes,
+                "used_bytes": self._used,
+                "entries": len(self._entries),
+                "evictions": self._evictions,
+                "rejected": self._rejected,
+            }
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process backend storing live objects.
+    Values are shared by reference and never serialized; their size is
+    estimated once when they are stored and charged to the process-wide
+    MemoryBudget, which evicts the least recently used entries of all memory
+    backends when it is exceeded. ``maxsize`` still caps the number of
+    entries of this cache, evicting its own least recently used entry.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, budget: MemoryBudget):
+        super().__init__(name, maxsize, ttl)
+        self.budget = budget
+        self._entries = OrderedDict()
+        self._lock = budget.lock
+        self._version = None
+        self._evictions = 0
+        self._expirations = 0
+
+    def __repr__(self) -> str:
+        return f"MemoryBackend({self.name!r})"
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            expires_at, value, _ = self._entries[key]
+            if expires_at <= time():
+                self._remove(key)
+                self._expirations += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.budget.touch(self, key)
+            return value
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+        now = time()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    self._remove(key)
+                    self._expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.budget.touch(self, key)
+                    found[key] = entry[1]
+        return found
+
+    def _store(self, key: Any, value: Any, size: int, expires_at: float) -> None:
+        """Charge and store an entry; the caller holds the lock."""
+        if not self.budget.charge(self, key, size):
+            return
+        self._entries[key] = (expires_at, value, size)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self.budget.release(self, self._entries.popitem(last=False)[0])
+            self._evictions += 1
+
+    def _evict(self, key: Any) -> None:
+        """Drop an entry on behalf of the memory budget; the caller holds the lock."""
+        if self._entries.pop(key, None) is not None:
+            self._evictions += 1
+
+    def _remove(self, key: Any) -> None:
+        """Drop an entry and its charge; the caller holds the lock."""
+        del self._entries[key]
+        self.budget.release(self, key)
+
+    def set(self, key: Any, value: Any) -> None:
+        size = estimate_size(value)
+        with self._lock:
+            self._store(key, value, size, time() + self.ttl)
+
+    def set_many(self, values: dict) -> None:
+        sizes = {key: estimate_size(value) for key, value in values.items()}
+        expires_at = time() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._store(key, value, sizes[key], expires_at)
+
+    def _drop_all(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def clear(self) -> None:
+        self._drop_all()
+
+    def invalidate(self, version: int) -> None:
+        with self._lock:
+            changed = self._version is not None and self._version != version
+            self._version = version
+        if changed:
+            self._drop_all()
+
+    def _expire(self) -> None:
+        now = time()
+        with self._lock:
+            expired = [key for key, (expires_at, _, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self._expirations += len(expired)
+
+    def storage_stats(self) -> dict:
+        self._expire()
+        with self._lock:
+            return {
+                "evictions": self._evictions,
+                "expired": self._expirations,
+                "approx_bytes": sum(size for _, _, size in self._entries.values()),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SerializingBackend(CacheBackend):
+    """
+    Base class of the backends that store values outside the process,
+    encoded with ``encode_value``, recording how much time and how many bytes
+    serialization costs.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        if msgpack is None:
+            raise RuntimeError(f"{type(self).__name__} requires the msgpack package")
+        super().__init__(name, maxsize, ttl)
+        self._metrics_lock = Lock()
+        self._serializations = 0
+        self._serialize_seconds = 0.0
+        self._serialized_bytes = 0
+        self._deserializations = 0
+        self._deserialize_seconds = 0.0
+
+    @staticmethod
+    def encode_key(key: Any) -> str:
+        """
+        Turn a hashable cache key into a stable string usable across processes.
+        Args:
+            key (Any): The cache key, usually a tuple of plain values.
+        Returns:
+            str: A hex digest of the key's representation.
+        """
+        return blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value, recording the cost."""
+        start = perf_counter()
+        data = encode_value(value)
+        elapsed = perf_counter() - start
+        with self._metrics_lock:
+            self._serializations += 1
+            self._serialize_seconds += elapsed
+            self._serialized_bytes += len(data)
+        return data
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decode a value, recording the cost.
+        Raises:
+            KeyError: If the stored data cannot be decoded, so it is a miss.
+        """
+        start = perf_counter()
+        try:
+            value = decode_value(data)
+        except ValueError as e:
+            raise KeyError("undecodable cache entry") from e
+        elapsed = perf_counter() - start
+        with self._metrics_lock:
+            self._deserializations += 1
+            self._deserialize_seconds += elapsed
+        return value
+
+    @staticmethod
+    def _stored_version(data: bytes) -> Any:
+        """Decode a version marker, or None if it is unreadable."""
+        try:
+            return decode_value(data)
+        except ValueError:
+            return None
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._metrics_lock:
+            return {
+                **stats,
+                "serializations": self._serializations,
+                "serialize_ms": round(self._serialize_seconds * 1000, 3),
+                "serialized_bytes": self._serialized_bytes,
+                "deserializations": self._deserializations,
+                "deserialize_ms": round(self._deserialize_seconds * 1000, 3),
+            }
+
+
+class SQLiteBackend(SerializingBackend):
+    """
+    Backend sharing entries between all worker processes on one host through
+    a SQLite file in WAL mode. Each thread keeps its own connection. The file
+    must sit in a directory private to the current user (see
+    ``ensure_private_path``).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, path: str):
+        super().__init__(name, maxsize, ttl)
+        ensure_private_path(path)
+        self.path = str(Path(path).expanduser())
+        self._local = local()
+        self._writes = 0
+        self._evictions = 0
+        self._expirations = 0
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_cache_entries_expiry
+            ON cache_entries (namespace, expires_at)
+            """
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's autocommit connection, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: Any) -> Any:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.name, self.encode_key(key)),
+        ).fetchone()
+        if row is None or row[1] < time():
+            raise KeyError(key)
+        return self.loads(row[0])
+
+    def set(self, key: Any, value: Any) -> None:
+        conn = self._connection()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (self.name, self.encode_key(key), self.dumps(value), time() + self.ttl),
+        )
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Delete expired entries, then the ones closest to expiry beyond maxsize."""
+        expired = conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at < ?",
+            (self.name, time()),
+        ).rowcount
+        evicted = conn.execute(
+            """
+            DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries WHERE namespace = ?
+                ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.name, self.name, self.maxsize),
+        ).rowcount
+        with self._metrics_lock:
+            self._expirations += expired
+            self._evictions += evicted
+
+    def storage_stats(self) -> dict:
+        """
+        Report the evictions and expirations pruned by this process and the
+        serialized size of the entries currently stored by all processes.
+        """
+        approx_bytes = self._connection().execute(
+            "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache_entries WHERE namespace = ?",
+            (self.name,),
+        ).fetchone()[0]
+        with self._metrics_lock:
+            return {
+                "evictions": self._evictions,
+                "expired": self._expirations,
+                "approx_bytes": approx_bytes,
+            }
+
+    def clear(self) -> None:
+        self._connection().execute(
+            "DELETE FROM cache_entries WHERE namespace = ?", (self.name,)
+        )
+
+    def invalidate(self, version: int) -> None:
+        marker = self.encode_key(VERSION_MARKER)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.name, marker),
+            ).fetchone()
+            if row is None or self._stored_version(row[0]) != version:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.name,))
+                conn.execute(
+                    "INSERT INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.name, marker, encode_value(version), float("inf")),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def __len__(self) -> int:
+        return self._connection().execute(
+            """
+            SELECT COUNT(*) FROM cache_entries
+            WHERE namespace = ? AND key != ? AND expires_at >= ?
+            """,
+            (self.name, self.encode_key(VERSION_MARKER), time()),
+        ).fetchone()[0]
+
+
+class TieredBackend(CacheBackend):
+    """
+    Two-tier backend: a per-process memory L1 in front of a persistent SQLite
+    L2 on local disk. Misses in L1 are looked up in L2 and promoted, so a
+    fresh process on the same host starts with the results computed by the
+    previous ones instead of recomputing them.
+    """
+
+    def __init__(self, l1: MemoryBackend, l2: SQLiteBackend):
+        super().__init__(l1.name, l1.maxsize, l1.ttl)
+        self.l1 = l1
+        self.l2 = l2
+        self._l2_hits = 0
+        self._l2_misses = 0
+
+    def get(self, key: Any) -> Any:
+        try:
+            return self.l1.get(key)
+        except KeyError:
+            pass
+        try:
+            value = self.l2.get(key)
+        except KeyError:
+            with self._counters_lock:
+                self._l2_misses += 1
+            raise
+        with self._counters_lock:
+            self._l2_hits += 1
+        self.l1.set(key, value)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self.l1.set(key, value)
+        self.l2.set(key, value)
+
+    def clear(self) -> None:
+        self.l1.clear()
+        self.l2.clear()
+
+    def invalidate(self, version: int) -> None:
+        self.l1.invalidate(version)
+        self.l2.invalidate(version)
+
+    def storage_stats(self) -> dict:
+        l2_stats = self.l2.stats()
+        with self._counters_lock:
+            return {
+                **self.l1.storage_stats(),
+                "l2_hits": self._l2_hits,
+                "l2_misses": self._l2_misses,
+                "l2_entries": l2_stats["entries"],
+                "l2_bytes": l2_stats["approx_bytes"],
+                "deserialize_ms": l2_stats["deserialize_ms"],
+                "serialize_ms": l2_stats["serialize_ms"],
+            }
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+
+class InMemoryRedis:
+    """
+    Minimal stand-in for a Redis client, implementing the subset of commands
+    used by RedisBackend. Meant for tests and local development.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = Lock()
+
+    def _live(self, name: str):
+        item = self._data.get(name)
+        if item is not None and item[1] is not None and item[1] < time():
+            del self._data[name]
+            return None
+        return item
+
+    def get(self, name: str):
+        with self._lock:
+            item = self._live(name)
+            return item[0] if item else None
+
+    def set(self, name: str, value: bytes, ex: int = None) -> bool:
+        with self._lock:
+            self._data[name] = (value, time() + ex if ex else None)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            names = [name for name in self._data if self._live(name) is not None]
+        return iter([name for name in names if fnmatchcase(name, match)])
+
+
+class RedisBackend(SerializingBackend):
+    """
+    Backend storing entries in Redis (or any client speaking its API), keys
+    prefixed by cache name. Entry expiry is delegated to Redis; ``maxsize``
+    is left to the server's ``maxmemory`` policy.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, client):
+        super().__init__(name, maxsize, ttl)
+        self.client = client
+        self.prefix = f"bookonthetable:{name}:"
+
+    def get(self, key: Any) -> Any:
+        data = self.client.get(self.prefix + self.encode_key(key))
+        if data is None:
+            raise KeyError(key)
+        return self.loads(data)
+
+    def set(self, key: Any, value: Any) -> None:
+        self.client.set(
+            self.prefix + self.encode_key(key), self.dumps(value), ex=int(self.ttl)
+        )
+
+    def clear(self) -> None:
+        names = list(self.client.scan_iter(match=self.prefix + "*"))
+        if names:
+            self.client.delete(*names)
+
+    def invalidate(self, version: int) -> None:
+        marker = self.prefix + VERSION_MARKER
+        stored = self.client.get(marker)
+        if stored is None or self._stored_version(stored) != version:
+            self.clear()
+            self.client.set(marker, encode_value(version))
+
+    def __len__(self) -> int:
+        marker = self.prefix + VERSION_MARKER
+        return sum(
+            1
+            for name in self.client.scan_iter(match=self.prefix + "*")
+            if name not in (marker, marker.encode("utf-8"))
+        )
+
+
+_shared_redis_client = None
+
+
+def create_backend(
+    name: str,
+    maxsize: int,
+    ttl: float,
+    kind: str,
+    sqlite_path: str,
+    redis_url: str,
+    budget: MemoryBudget,
+    l2_path: str = None,
+) -> CacheBackend:
+    """
+    Build the backend for one named cache.
+    Args:
+        name (str): The cache name, used as namespace in shared stores.
+        maxsize (int): Maximum number of entries.
+        ttl (float): Entry lifetime in seconds.
+        kind (str): One of "memory", "sqlite", "redis" or "redis-stub".
+        sqlite_path (str): Database file used by the sqlite backend.
+        redis_url (str): Server URL used by the redis backend.
+        budget (MemoryBudget): Byte budget shared by the memory backends.
+        l2_path (str): SQLite file of a persistent L2 tier behind a memory
+            backend, or None for a single tier.
+    Returns:
+        CacheBackend: The backend instance.
+    """
+    global _shared_redis_client
+    if kind == "sqlite":
+        return SQLiteBackend(name, maxsize, ttl, sqlite_path)
+    if kind in ("redis", "redis-stub"):
+        if _shared_redis_client is None:
+            if kind == "redis-stub":
+                _shared_redis_client = InMemoryRedis()
+            elif redis is None:
+                raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+            else:
+                _shared_redis_client = redis.Redis.from_url(redis_url)
+        return RedisBackend(name, maxsize, ttl, _shared_redis_client)
+    if l2_path:
+        return TieredBackend(
+            MemoryBackend(name, maxsize, ttl, budget), SQLiteBackend(name, maxsize, ttl, l2_path)
+        )
+    return MemoryBackend(name, maxsize, ttl, budget)
@@ -0,0 +1,134 @@
+from fastapi import Request, Response
+from typing import Any, Mapping, Optional
+from io import BytesIO
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/vnd.apache.arrow.stream": ARROW_STREAM,
+    "application/x-apache-arrow-stream": ARROW_STREAM,
+}
+
+
+def negotiate_media_type(accept: str, offered: list) -> str:
+    """
+    Pick the response media type best matching an Accept header.
+    Explicit media types with a higher q-value win; wildcards and ties fall
+    back to the order of ``offered``, whose first entry is the default.
+    Types with ``q=0`` are not acceptable and never chosen; when nothing
+    else matches, the default is returned.
+    Args:
+        accept (str): The raw Accept header value.
+        offered (list): Media types the route can produce, default first.
+    Returns:
+        str: The chosen media type.
+    """
+    weights = {}
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+        media_type = MEDIA_TYPE_ALIASES.get(media_type, media_type)
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[media_type] = max(quality, weights.get(media_type, 0.0))
+
+    best, best_quality = offered[0], -1.0
+    for media_type in offered:
+        quality = weights.get(media_type)
+        if quality is None or quality <= 0:
+            continue
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def _msgpack_default(value: Any) -> Any:
+    """
+    Convert the values MessagePack cannot encode natively: read-only
+    mappings (shared book records) become dicts, anything else a string.
+    """
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    """
+    Encode a payload as MessagePack.
+    Args:
+        payload (Any): JSON-like data (mappings, lists, scalars).
+    Returns:
+        bytes: The MessagePack document.
+    """
+    return msgpack.packb(payload, use_bin_type=True, default=_msgpack_default)
+
+
+def encode_arrow(records: list) -> bytes:
+    """
+    Encode a list of records as an Arrow IPC stream with one column per field.
+    Args:
+        records (list): A list of dictionaries sharing the same keys.
+    Returns:
+        bytes: The Arrow IPC stream.
+    """
+    table = pyarrow.Table.from_pylist(records)
+    sink = BytesIO()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def negotiated_response(
+    request: Request, payload: Any, records: Optional[list] = None
+) -> Optional[Response]:
+    """
+    Encode a route result in the format requested by the client's Accept header.
+    MessagePack carries ``payload`` as is; Arrow IPC is offered only when
+    ``records`` is given and carries them as columns. Formats whose library
+    is not installed are not offered.
+    Routes opt in by calling this first and returning their usual model when
+    it returns None, so the JSON path and its response model are unchanged.
+    Args:
+        request (Request): The incoming request.
+        payload (Any): The JSON-like data the route would otherwise return.
+        records (Optional[list]): Row records to expose in columnar form.
+    Returns:
+        Optional[Response]: The encoded response, or None if JSON was chosen.
+    """
+    offered = [JSON]
+    if msgpack is not None:
+        offered.append(MSGPACK)
+    if pyarrow is not None and records is not None:
+        offered.append(ARROW_STREAM)
+
+    media_type = negotiate_media_type(request.headers.get("accept", ""), offered)
+    if media_type == MSGPACK:
+        content = encode_msgpack(payload)
+    elif media_type == ARROW_STREAM:
+        content = encode_arrow(records)
+    else:
+        return None
+    return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
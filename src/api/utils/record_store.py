@@ -0,0 +1,119 @@
+from src.api.utils.cache import current_catalog_version
+from utils.database_manager import DatabaseManager
+from utils.catalog import get_catalog_version_in
+from logging import getLogger, basicConfig, INFO
+from types import MappingProxyType
+from threading import Lock
+from pathlib import Path
+from array import array
+from sys import intern
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DB_PATH = Path(__file__).resolve().parents[3] / "tmp" / "bookonthetable.db"
+INTERNED_FIELDS = ("category", "availability", "scraped_at")
+
+manager = DatabaseManager(str(DB_PATH))
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+
+class RecordStore:
+    """
+    Immutable book records of one catalog version, shared by every book cache.
+    Caches keep compact arrays of IDs and resolve them here, so each book is
+    held in memory once no matter how many cached results contain it.
+    """
+
+    def __init__(self, version: int, records: dict):
+        self.version = version
+        self._records = records
+
+    def resolve(self, ids: array) -> list:
+        """
+        Turn an array of book IDs into their records, in the same order.
+        IDs missing from this version of the catalog are skipped.
+        Args:
+            ids (array): The book IDs.
+        Returns:
+            list: Read-only mappings with the book fields.
+        """
+        records = self._records
+        return [records[book_id] for book_id in ids if book_id in records]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def book_ids(rows: list) -> array:
+    """
+    Pack the IDs of query rows into a compact array.
+    Args:
+        rows (list): Rows with an ``id`` column.
+    Returns:
+        array: The IDs as signed 64-bit integers.
+    """
+    return array("q", (row["id"] for row in rows))
+
+
+def load_record_store(manager: DatabaseManager) -> RecordStore:
+    """
+    Read every book into a new RecordStore, within one read transaction so the
+    records match the catalog version they are tagged with.
+    Field names and repeated values (category, availability, scrape date) are
+    interned so records share a single copy of them.
+    Args:
+        manager (DatabaseManager): The database holding the catalog.
+    Returns:
+        RecordStore: The records of the current catalog version.
+    """
+    with manager.transaction() as conn:
+        # sqlite3 does not open a transaction for SELECTs on its own.
+        conn.execute("BEGIN")
+        version = get_catalog_version_in(conn)
+        cursor = conn.execute("SELECT * FROM books ORDER BY id")
+        columns = [intern(column[0]) for column in cursor.description]
+        interned = [column in INTERNED_FIELDS for column in columns]
+        records = {}
+        for row in cursor:
+            record = {
+                column: intern(value) if intern_value and isinstance(value, str) else value
+                for column, value, intern_value in zip(columns, row, interned)
+            }
+            records[record["id"]] = MappingProxyType(record)
+    return RecordStore(version, records)
+
+
+_store = None
+_store_version = None
+_store_lock = Lock()
+
+
+def get_record_store() -> RecordStore:
+    """
+    Return the record store of the current catalog version, loading it once
+    per version; the store of the previous version is released.
+    Returns:
+        RecordStore: The shared record store.
+    """
+    global _store, _store_version
+    version = current_catalog_version()
+    if _store_version != version:
+        with _store_lock:
+            if _store_version != version:
+                _store = load_record_store(manager)
+                _store_version = version
+                logger.info(f"Loaded {len(_store)} book records for catalog version {_store.version}.")
+    return _store
+
+
+def resolve_books(ids: array) -> list:
+    """
+    Resolve cached book IDs against the current record store.
+    Args:
+        ids (array): The book IDs, or None if the lookup failed.
+    Returns:
+        list: The book records, or None if ``ids`` is None.
+    """
+    if ids is None:
+        return None
+    return get_record_store().resolve(ids)
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from logging import getLogger, basicConfig, INFO
+from importlib import import_module
+from time import perf_counter
+from typing import Optional
+import json
+from src.api.config import (
+    CACHE_WARMUP_MANIFEST,
+    CACHE_WARMUP_MANIFEST_PATH,
+    CACHE_WARMUP_CONCURRENCY,
+    CACHE_WARMUP_TIMEOUT,
+)
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+
+def load_manifest(path: Optional[str] = CACHE_WARMUP_MANIFEST_PATH) -> list:
+    """
+    Load the warm-up manifest.
+    Args:
+        path (Optional[str]): JSON file replacing the default manifest, if any.
+    Returns:
+        list: Entries with a "call" ("module:function") and optional "args"
+        and "kwargs".
+    """
+    if not path:
+        return CACHE_WARMUP_MANIFEST
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _run_entry(entry: dict) -> dict:
+    """
+    Execute one manifest entry and time it.
+    Args:
+        entry (dict): The manifest entry.
+    Returns:
+        dict: The call, its status ("ok", "empty" or "error") and duration.
+    """
+    start = perf_counter()
+    try:
+        module_name, function_name = entry["call"].split(":")
+        function = getattr(import_module(module_name), function_name)
+        result = function(*entry.get("args", []), **entry.get("kwargs", {}))
+        status = "ok" if result is not None else "empty"
+        error = None
+    except Exception as e:
+        status = "error"
+        error = str(e)
+    return {
+        "call": entry.get("call"),
+        "status": status,
+        "error": error,
+        "ms": round((perf_counter() - start) * 1000, 1),
+    }
+
+
+def run_warmup(
+    manifest: list,
+    concurrency: int = CACHE_WARMUP_CONCURRENCY,
+    timeout: float = CACHE_WARMUP_TIMEOUT,
+) -> list:
+    """
+    Run the manifest entries in parallel, at most ``concurrency`` at a time.
+    Failures are logged and reported but never raised, so a broken entry does
+    not prevent the app from starting. Entries still running after ``timeout``
+    seconds are reported as "timeout" and left to finish in the background.
+    Args:
+        manifest (list): Entries from ``load_manifest``.
+        concurrency (int): Maximum number of calls running at once.
+        timeout (float): Seconds to wait for the whole manifest.
+    Returns:
+        list: One report per entry, in manifest order.
+    """
+    start = perf_counter()
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, concurrency), thread_name_prefix="cache-warmup"
+    )
+    futures = [executor.submit(_run_entry, entry) for entry in manifest]
+    wait(futures, timeout=timeout)
+    executor.shutdown(wait=False)
+
+    reports = []
+    for entry, future in zip(manifest, futures):
+        if future.done():
+            report = future.result()
+        else:
+            report = {"call": entry.get("call"), "status": "timeout", "error": None, "ms": None}
+        reports.append(report)
+        if report["status"] == "error":
+            logger.error(f"Warm-up {report['call']} failed after {report['ms']} ms: {report['error']}")
+        else:
+            logger.info(f"Warm-up {report['call']}: {report['status']} in {report['ms']} ms")
+
+    total_ms = round((perf_counter() - start) * 1000, 1)
+    ok = sum(report["status"] == "ok" for report in reports)
+    logger.info(f"Cache warm-up finished: {ok}/{len(reports)} entries in {total_ms} ms")
+    return reports
@@ -9,7 +9,9 @@ sys.path.append(ROOT_DIR)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = BASE_DIR / "tmp" / "bookonthetable.db"
 
+from utils.similarity_index import build_similarity_index
 from utils.database_manager import DatabaseManager
+from utils.catalog import sync_books
 from scraping import BooksScraper
 
 
@@ -45,12 +47,16 @@ def _summary(books) -> None:
         print(f"- {cat}: {count} book(s)")
 
 
-def _save_books_to_db(books: list) -> None:
+def _save_books_to_db(books: list, complete: bool = False) -> None:
     """
-    Inserts all scraped books into the database in a single batch.
+    Synchronises the books table with the scraped books, keyed by book URL.
+    New books are inserted and changed books updated; vanished books are
+    deleted only after a complete scrape. Each change is recorded in the
+    change log under a new catalog version.
 
     Args:
         books (list): List of dictionaries containing book data.
+        complete (bool): Whether every page of the site was scraped.
     Returns:
         None
     """
@@ -58,34 +64,27 @@ def _save_books_to_db(books: list) -> None:
         logger.warning("No books to save to the database.")
         return
 
-    query = """
-        INSERT INTO books (
-            title, price, rating, availability, category,
-            description, image_url, book_url, page_number, scraped_at
+    try:
+        result = sync_books(manager, books, complete=complete)
+        logger.info(
+            f"Catalog version {result['version']}: {result['inserted']} inserted, "
+            f"{result['updated']} updated, {result['deleted']} deleted book(s)."
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
+    except Exception as e:
+        logger.error(f"Failed to save books to the database: {e}")
 
-    values_list = [
-        (
-            book["title"],
-            book["price"],
-            book["rating"],
-            book["availability"],
-            book["category"],
-            book["description"],
-            book["image_url"],
-            book["book_url"],
-            book["page_number"],
-            book["scraped_at"],
-        )
-        for book in books
-    ]
+
+def _build_similarity_index() -> None:
+    """
+    Rebuilds the precomputed similar-books index from the books in the database.
+    Returns:
+        None
+    """
     try:
-        inserted = manager.insert_many(query, values_list)
-        logger.info(f"Successfully inserted {inserted} book(s) into the database.")
+        rows = build_similarity_index(manager)
+        logger.info(f"Similarity index rebuilt with {rows} neighbour row(s).")
     except Exception as e:
-        logger.error(f"Failed to insert books into the database: {e}")
+        logger.error(f"Failed to build the similarity index: {e}")
 
 
 def main():
@@ -93,7 +92,8 @@ def main():
 
     try:
         books = scraper.scrape_all_books()
-        _save_books_to_db(books)
+        _save_books_to_db(books, complete=scraper.complete)
+        _build_similarity_index()
         books = DataFrame(books)
         books.to_csv(BASE_DIR / "data" / "books_data.csv", index=False)
 
@@ -24,6 +24,8 @@ class BooksScraper:
             base_url (str): Base URL of the website to scrape.
         """
         self.base_url = base_url
+        self.failed_pages = 0
+        self.complete = False
         self.session = Session()
         self.session.headers.update(
             {
@@ -110,6 +112,7 @@ class BooksScraper:
         """
         content = self.__get_page_content(page_url)
         if not content:
+            self.failed_pages += 1
             return []
 
         soup = BeautifulSoup(content, "html.parser")
@@ -129,6 +132,7 @@ class BooksScraper:
                 sleep(0.2)
             except Exception as e:
                 logger.error(f"Error processing book {idx} on page {page_number}: {e}")
+                self.failed_pages += 1
                 continue
 
         next_page_url = self.__get_next_page_url(soup, page_url)
@@ -299,13 +303,17 @@ class BooksScraper:
     def scrape_all_books(self) -> list[dict]:
         """
         Scrape all books from all categories.
+        ``complete`` is set afterwards if every category and page was fetched
+        and parsed, so the result can be trusted to list the whole catalog.
         Returns:
             list: List of dictionaries containing book data.
         """
         logger.info("Iniciating scraping of all books...")
         all_books = []
+        self.failed_pages = 0
 
         category_urls = self.__get_all_category_urls()
+        found_categories = bool(category_urls)
 
         if not category_urls:
             logger.warning("No category URLs found. Exiting scraping.")
@@ -316,7 +324,10 @@ class BooksScraper:
             results = self.__scrape_books_from_page(category_url)
             logger.info(f"Found {len(results)} books in category {category_url}")
             all_books.extend(results)
+        self.complete = found_categories and self.failed_pages == 0
         logger.info(f"Scraping completed. Total books found: {len(all_books)}")
+        if not self.complete:
+            logger.warning(f"Scrape incomplete: {self.failed_pages} page(s) or book(s) failed.")
         return all_books
 
     def save_to_csv(self, books, filename="books_data.csv"):
@@ -22,7 +22,7 @@ def assert_successful(response: tuple) -> None:
     logger.info("Request successful.")
 
 def main() -> None:
-    BASE_URL = "https://book-on-the-table.vercel.app"
+    BASE_URL = os.getenv("API_BASE_URL", "https://book-on-the-table.vercel.app")
     api = APIHandler(BASE_URL)
 
     logger.info("Testing home endpoint...")
@@ -65,6 +65,27 @@ def main() -> None:
         logger.info(f"Testing book by ID endpoint - iteration {i+1}...")
         assert_successful(api.test_book_by_id(access_token))
 
+        logger.info(f"Testing similar books endpoint - iteration {i+1}...")
+        assert_successful(api.test_book_similar(access_token))
+
+        logger.info(f"Testing book history endpoint - iteration {i+1}...")
+        assert_successful(api.test_book_history(access_token))
+
+    logger.info("Testing book changes endpoint...")
+    changes, ok, payload = api.test_books_changes(access_token)
+    assert_successful((changes, ok, payload))
+    if ok:
+        logger.info("Testing book changes endpoint from the current version...")
+        assert_successful(api.test_books_changes(access_token, changes["version"]))
+
+    for export_format in ("csv", "parquet", "arrow"):
+        logger.info(f"Testing books export endpoint - {export_format}...")
+        assert_successful(api.test_books_export(access_token, export_format))
+
+    for media_type in ("application/msgpack", "application/vnd.apache.arrow.stream"):
+        logger.info(f"Testing books endpoint negotiated as {media_type}...")
+        assert_successful(api.test_books_negotiated(access_token, media_type))
+
     logger.info("Testing categories endpoint...")
     assert_successful(api.test_categories(access_token))
 
@@ -74,6 +95,12 @@ def main() -> None:
     logger.info("Testing stats by categories endpoint...")
     assert_successful(api.test_stats_categories(access_token))
 
+    logger.info("Testing stats prices endpoint...")
+    assert_successful(api.test_stats_prices(access_token))
+
+    logger.info("Testing stats crosstab endpoint...")
+    assert_successful(api.test_stats_crosstab(access_token))
+
     logger.info("Testing ML features endpoint...")
     assert_successful(api.test_ml_features(access_token))
 
@@ -0,0 +1,138 @@
+from pathlib import Path
+import sys
+import os
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(ROOT_DIR)
+
+from src.api.utils.cache_backends import MemoryBudget, create_backend
+from logging import getLogger, basicConfig, INFO
+from tempfile import mkdtemp
+from array import array
+from time import sleep
+import numpy as np
+import shutil
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+KINDS = ["memory", "tiered", "sqlite", "redis-stub"]
+TTL = 1.0
+
+
+def make_backend(kind: str, name: str, directory: Path, ttl: float = TTL):
+    """
+    Builds a backend of one kind the way the app does, with its files in a
+    private temporary directory.
+    Args:
+        kind (str): One of KINDS; "tiered" is a memory L1 in front of a SQLite L2.
+        name (str): The cache name.
+        directory (Path): Directory holding the SQLite files.
+        ttl (float): Entry lifetime in seconds.
+    Returns:
+        CacheBackend: The backend instance.
+    """
+    budget = MemoryBudget(1024 * 1024)
+    return create_backend(
+        name,
+        100,
+        ttl,
+        "memory" if kind == "tiered" else kind,
+        str(directory / "cache.db"),
+        "",
+        budget,
+        l2_path=str(directory / "l2.db") if kind == "tiered" else None,
+    )
+
+
+def check_backend(kind: str, directory: Path) -> list:
+    """
+    Runs the get/set, bulk, expiry and invalidation checks on one backend.
+    Args:
+        kind (str): The backend kind.
+        directory (Path): Directory holding the SQLite files.
+    Returns:
+        list: A description of every failed check, empty if all passed.
+    """
+    failures = []
+
+    def expect(condition: bool, description: str) -> None:
+        if not condition:
+            failures.append(f"{kind}: {description}")
+
+    cache = make_backend(kind, f"check_{kind.replace('-', '_')}", directory)
+    value = {
+        "ids": array("q", [3, 1, 2]),
+        "prices": np.array([1.5, 2.5]),
+        "pair": (1, "a"),
+        "rows": [{"id": 1, "title": "A"}],
+    }
+    cache.set(("k", 1), value)
+    stored = cache.get(("k", 1))
+    expect(stored["ids"] == value["ids"], "array values round-trip")
+    expect(np.array_equal(stored["prices"], value["prices"]), "NumPy values round-trip")
+    expect(stored["pair"] == value["pair"] and stored["rows"] == value["rows"], "tuples and rows round-trip")
+
+    try:
+        cache.get(("missing",))
+        expect(False, "a missing key raises KeyError")
+    except KeyError:
+        pass
+
+    cache.set_many({("m", i): i * 10 for i in range(5)})
+    found = cache.get_many([("m", i) for i in range(7)])
+    expect(found == {("m", i): i * 10 for i in range(5)}, "get_many returns only the stored keys")
+
+    if kind in ("sqlite", "redis-stub"):
+        try:
+            cache.set(("bad",), object())
+            expect(False, "arbitrary objects are refused")
+        except TypeError:
+            pass
+
+    cache.invalidate(1)
+    cache.set(("v", 1), "kept")
+    cache.invalidate(1)
+    expect(cache.get(("v", 1)) == "kept", "invalidate keeps entries of the same version")
+    cache.invalidate(2)
+    try:
+        cache.get(("v", 1))
+        expect(False, "invalidate drops entries of another version")
+    except KeyError:
+        pass
+
+    cache.set(("e",), "expires")
+    sleep(TTL + 0.6)
+    try:
+        cache.get(("e",))
+        expect(False, "entries expire after the TTL")
+    except KeyError:
+        pass
+
+    stats = cache.stats()
+    expect(stats["hits"] == 0 and stats["misses"] == 0, "backends leave hit counting to the decorators")
+    cache.clear()
+    expect(len(cache) == 0, "clear empties the cache")
+    return failures
+
+
+def main() -> None:
+    directory = Path(mkdtemp(prefix="bookonthetable_cache_check_"))
+    failures = []
+    try:
+        for kind in KINDS:
+            logger.info(f"Checking the {kind} cache backend...")
+            failures += check_backend(kind, directory)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for failure in failures:
+        logger.error(f"Check failed - {failure}")
+    if failures:
+        sys.exit(1)
+    logger.info("All cache backend checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from pathlib import Path
+import sys
+import os
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(ROOT_DIR)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+from src.api.schemas.ml_schema import FeatureResponse, TrainingDataResponse
+from src.api.services.ml_service import extract_features, get_training_data
+from src.api.utils.negotiation import encode_msgpack, encode_arrow
+from logging import getLogger, basicConfig, INFO
+from time import perf_counter
+from json import dumps
+import gzip
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+REPEAT = 20
+
+
+def encode_json(model_class, key: str, records: list) -> bytes:
+    """
+    Reproduces the default FastAPI path: build the response model, dump it
+    in JSON mode and serialize it as JSONResponse does.
+    Args:
+        model_class: The Pydantic response model of the route.
+        key (str): The field holding the records.
+        records (list): The records returned by the service.
+    Returns:
+        bytes: The JSON body.
+    """
+    content = model_class(**{key: records}).model_dump(mode="json")
+    return dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def measure(encoder) -> tuple:
+    """
+    Runs an encoder REPEAT times and returns its best time and output.
+    Args:
+        encoder (callable): A zero-argument function returning bytes.
+    Returns:
+        tuple: Best time in milliseconds and the encoded body.
+    """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        body = encoder()
+        best = min(best, perf_counter() - start)
+    return best * 1000, body
+
+
+def main() -> None:
+    cases = [
+        ("/api/v1/ml/features", FeatureResponse, "features", extract_features()),
+        (
+            "/api/v1/ml/training-data",
+            TrainingDataResponse,
+            "training_data",
+            get_training_data(),
+        ),
+    ]
+
+    print(f"\n{'endpoint':<26}{'encoding':<10}{'encode ms':>11}{'bytes':>11}{'gzip bytes':>12}")
+    for endpoint, model_class, key, records in cases:
+        encoders = {
+            "json": lambda: encode_json(model_class, key, records),
+            "msgpack": lambda: encode_msgpack({key: records}),
+            "arrow": lambda: encode_arrow(records),
+        }
+        for name, encoder in encoders.items():
+            try:
+                elapsed, body = measure(encoder)
+            except Exception as e:
+                logger.warning(f"Skipping {name} for {endpoint}: {e}")
+                continue
+            compressed = len(gzip.compress(body, compresslevel=6))
+            print(f"{endpoint:<26}{name:<10}{elapsed:>11.2f}{len(body):>11}{compressed:>12}")
+
+
+if __name__ == "__main__":
+    main()
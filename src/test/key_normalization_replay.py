@@ -0,0 +1,54 @@
+from pathlib import Path
+import sys
+import os
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(ROOT_DIR)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+from src.api.services.prewarm_service import get_logged_requests, replay_hit_rate
+from src.api.utils.cache import normalize_text, normalize_min_price, normalize_max_price
+from logging import getLogger, basicConfig, INFO
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+WINDOW_DAYS = 30
+
+NORMALIZERS = {
+    "/api/v1/books/search": lambda title, category: (
+        normalize_text(title),
+        normalize_text(category),
+    ),
+    "/api/v1/books/price-range": lambda min_price, max_price: (
+        normalize_min_price(min_price),
+        normalize_max_price(max_price),
+    ),
+}
+
+
+def main() -> None:
+    """
+    Replays the logged search and price range requests through a cold cache,
+    keyed on the raw arguments and on the normalized ones, and prints the
+    hit rate of each.
+    """
+    requests = get_logged_requests(WINDOW_DAYS)
+    print(f"\n{'endpoint':<28}{'requests':>10}{'raw keys':>10}{'norm keys':>11}{'raw hit %':>11}{'norm hit %':>12}")
+    for endpoint, normalize in NORMALIZERS.items():
+        raw = [request for request in requests if request[0] == endpoint]
+        if not raw:
+            logger.warning(f"No logged requests for {endpoint} in the last {WINDOW_DAYS} days")
+            continue
+        normalized = [(endpoint, normalize(*args)) for _, args in raw]
+        raw_rate = replay_hit_rate(raw, set()) * 100
+        normalized_rate = replay_hit_rate(normalized, set()) * 100
+        print(
+            f"{endpoint:<28}{len(raw):>10}{len(set(raw)):>10}{len(set(normalized)):>11}"
+            f"{raw_rate:>11.1f}{normalized_rate:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
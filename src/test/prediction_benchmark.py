@@ -0,0 +1,117 @@
+from pathlib import Path
+import sys
+import os
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(ROOT_DIR)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+from src.api.services.ml_service import PRICE_THRESHOLD, POSITIVE_CATEGORIES, predict
+from src.api.schemas.ml_schema import PredictionRequest
+from src.api.utils.cache import ml_predict_cache
+from logging import getLogger, basicConfig, INFO, WARNING
+from pydantic import BaseModel
+from time import perf_counter
+from typing import List
+import random
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+BATCH_SIZES = (1, 100, 10_000, 100_000)
+CATEGORIES = ("Travel", "Mystery", "Historical Fiction", "Poetry", "Science", "Unknown Category")
+# Minimum total time spent per measurement, so small batches are repeated.
+MIN_SECONDS = 0.5
+
+
+class LegacyPredictionFeature(BaseModel):
+    """
+    The previous request item schema, validated into one model per item.
+    """
+    price: float
+    category: str
+
+
+class LegacyPredictionRequest(BaseModel):
+    """
+    The previous request schema, kept as a baseline.
+    """
+    features: List[LegacyPredictionFeature]
+
+
+def predict_loop(features: list) -> list:
+    """
+    The previous per-item implementation of ``predict``, kept as a baseline.
+    Args:
+        features (list): LegacyPredictionFeature objects.
+    Returns:
+        list: The predicted labels.
+    """
+    return [
+        1 if feat.price >= PRICE_THRESHOLD or feat.category in POSITIVE_CATEGORIES
+        else 0 for feat in features
+    ]
+
+
+def items_per_second(function, batch: list) -> float:
+    """
+    Calls a function on a batch until MIN_SECONDS have passed.
+    Args:
+        function (callable): Function taking the batch.
+        batch (list): The batch passed to every call.
+    Returns:
+        float: Throughput of the best call, in items per second.
+    """
+    best, spent = float("inf"), 0.0
+    while spent < MIN_SECONDS:
+        start = perf_counter()
+        function(batch)
+        elapsed = perf_counter() - start
+        best, spent = min(best, elapsed), spent + elapsed
+    return len(batch) / best
+
+
+def main() -> None:
+    # The function without its per-item cache, so every call evaluates the whole batch.
+    vectorized = predict.__wrapped__
+    rng = random.Random(42)
+    getLogger("src.api.services.ml_service").setLevel(WARNING)
+
+    print(
+        f"\n{'batch':>8}{'legacy/s':>14}{'vectorized/s':>15}{'speedup':>9}"
+        f"{'loop only/s':>15}{'numpy only/s':>15}{'cached cold/s':>15}{'cached warm/s':>15}"
+    )
+    for size in BATCH_SIZES:
+        payload = {
+            "features": [
+                {"price": round(rng.uniform(5, 60), 2), "category": rng.choice(CATEGORIES)}
+                for _ in range(size)
+            ]
+        }
+        legacy_batch = LegacyPredictionRequest(**payload).features
+        batch = PredictionRequest(**payload).features
+        assert vectorized(batch) == predict_loop(legacy_batch)
+        # Request validation plus scoring, as done by the route.
+        legacy = items_per_second(
+            lambda _: predict_loop(LegacyPredictionRequest(**payload).features), batch
+        )
+        current = items_per_second(
+            lambda _: vectorized(PredictionRequest(**payload).features), batch
+        )
+        loop = items_per_second(predict_loop, legacy_batch)
+        fast = items_per_second(vectorized, batch)
+        # Per-item cache: every item missing, then every item cached.
+        ml_predict_cache.clear()
+        start = perf_counter()
+        predict(batch)
+        cold = len(batch) / (perf_counter() - start)
+        warm = items_per_second(predict, batch)
+        print(
+            f"{size:>8}{legacy:>14,.0f}{current:>15,.0f}{current / legacy:>8.1f}x"
+            f"{loop:>15,.0f}{fast:>15,.0f}{cold:>15,.0f}{warm:>15,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from pathlib import Path
+import sys
+import os
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.append(ROOT_DIR)
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+from src.api.utils.record_store import book_ids, load_record_store
+from utils.database_manager import DatabaseManager
+from logging import getLogger, basicConfig, INFO
+import subprocess
+import sqlite3
+import gc
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+SOURCE_DB = BASE_DIR / "tmp" / "bookonthetable.db"
+REPORT_DB = Path("/tmp") / "bookonthetable_100k.db"
+TARGET_BOOKS = 100_000
+
+
+def build_report_db() -> None:
+    """
+    Creates a catalog of TARGET_BOOKS books by replicating the scraped ones
+    with distinct titles and URLs, so descriptions have realistic sizes.
+    """
+    if REPORT_DB.exists():
+        return
+    source = sqlite3.connect(SOURCE_DB)
+    schema = source.execute("SELECT sql FROM sqlite_master WHERE name = 'books'").fetchone()[0]
+    rows = source.execute(
+        "SELECT title, price, rating, availability, category, description, image_url,"
+        " book_url, page_number, scraped_at FROM books"
+    ).fetchall()
+    source.close()
+
+    target = sqlite3.connect(REPORT_DB)
+    target.execute(schema)
+    copies = -(-TARGET_BOOKS // len(rows))
+    batch = []
+    for copy in range(copies):
+        for row in rows:
+            title, price, *middle, book_url, page_number, scraped_at = row
+            batch.append(
+                (f"{title} #{copy}", price, *middle, f"{book_url}?copy={copy}", page_number, scraped_at)
+            )
+    target.executemany(
+        "INSERT INTO books (title, price, rating, availability, category, description,"
+        " image_url, book_url, page_number, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        batch[:TARGET_BOOKS],
+    )
+    target.commit()
+    target.close()
+
+
+def workload(manager: DatabaseManager) -> list:
+    """
+    The queries behind the book caches: all books, every category, a spread
+    of price ranges, top-rated lists and single-book lookups.
+    Returns:
+        list: (clause, parameters) tuples completing a SELECT on books.
+    """
+    queries = [("ORDER BY id", ())]
+    for row in manager.select("SELECT DISTINCT LOWER(category) AS category FROM books"):
+        queries.append(("WHERE LOWER(category) = ? ORDER BY id", (row["category"],)))
+    for low in range(0, 60, 5):
+        queries.append(("WHERE price BETWEEN ? AND ? ORDER BY price", (float(low), float(low + 10))))
+    for limit in (10, 50, 100):
+        queries.append(("ORDER BY rating DESC, title ASC LIMIT ?", (limit,)))
+    for book_id in range(1, TARGET_BOOKS, 100):
+        queries.append(("WHERE id = ?", (book_id,)))
+    return queries
+
+
+def rss_bytes() -> int:
+    """Returns the resident set size of this process."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(mode: str) -> None:
+    """
+    Fills the equivalent of the book caches in one representation and prints
+    the resident memory it added.
+    Args:
+        mode (str): "dicts" for per-entry lists of book dicts, "store" for a
+            shared record store with per-entry ID arrays.
+    """
+    manager = DatabaseManager(str(REPORT_DB))
+    queries = workload(manager)
+    gc.collect()
+    before = rss_bytes()
+    if mode == "dicts":
+        cached = [
+            [dict(row) for row in manager.select(f"SELECT * FROM books {clause}", params)]
+            for clause, params in queries
+        ]
+        books = sum(len(entry) for entry in cached)
+    else:
+        store = load_record_store(manager)
+        cached = [
+            book_ids(manager.select(f"SELECT id FROM books {clause}", params))
+            for clause, params in queries
+        ]
+        books = sum(len(store.resolve(entry)) for entry in cached)
+    gc.collect()
+    print(f"{mode} {len(queries)} {books} {rss_bytes() - before}")
+
+
+def main() -> None:
+    build_report_db()
+    print(f"\n{'representation':<16}{'entries':>9}{'books held':>12}{'RSS added (MB)':>16}")
+    for mode in ("dicts", "store"):
+        output = subprocess.run(
+            [sys.executable, __file__, mode], capture_output=True, text=True, check=True
+        ).stdout.split()
+        _, entries, books, added = output[-4:]
+        print(f"{mode:<16}{entries:>9}{books:>12}{int(added) / 1024 / 1024:>16.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        measure(sys.argv[1])
+    else:
+        main()
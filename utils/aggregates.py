@@ -0,0 +1,270 @@
+from utils.database_manager import DatabaseManager
+from typing import Optional
+import random
+import sqlite3
+
+DEFAULT_SAMPLE_SIZE = 10_000
+
+CATEGORY_STATS_DDL = """
+    CREATE TABLE IF NOT EXISTS category_stats (
+        category TEXT PRIMARY KEY NOT NULL,
+        count INTEGER NOT NULL,
+        price_count INTEGER NOT NULL,
+        price_sum REAL NOT NULL,
+        price_sumsq REAL NOT NULL,
+        min_price REAL,
+        max_price REAL
+    )
+"""
+RATING_STATS_DDL = """
+    CREATE TABLE IF NOT EXISTS rating_stats (
+        rating INTEGER NOT NULL PRIMARY KEY,
+        count INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+BOOKS_CATEGORY_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_books_category_price ON books (category, price)
+"""
+
+# Statements adding NEW to / removing OLD from the aggregates. NULL categories
+# and ratings are stored as '' and 0; NULL prices are counted as books but
+# left out of the price aggregates, as AVG/MIN/MAX do. When the removed price
+# was the category minimum or maximum, it is looked up again through the
+# (category, price) index.
+_ADD_BOOK = """
+    INSERT INTO category_stats
+        (category, count, price_count, price_sum, price_sumsq, min_price, max_price)
+    VALUES (
+        COALESCE(NEW.category, ''), 1, NEW.price IS NOT NULL,
+        COALESCE(NEW.price, 0), COALESCE(NEW.price * NEW.price, 0), NEW.price, NEW.price
+    )
+    ON CONFLICT(category) DO UPDATE SET
+        count = count + 1,
+        price_count = price_count + excluded.price_count,
+        price_sum = price_sum + excluded.price_sum,
+        price_sumsq = price_sumsq + excluded.price_sumsq,
+        min_price = CASE
+            WHEN min_price IS NULL OR excluded.min_price < min_price THEN excluded.min_price
+            ELSE min_price END,
+        max_price = CASE
+            WHEN max_price IS NULL OR excluded.max_price > max_price THEN excluded.max_price
+            ELSE max_price END;
+    INSERT INTO rating_stats (rating, count) VALUES (COALESCE(NEW.rating, 0), 1)
+    ON CONFLICT(rating) DO UPDATE SET count = count + 1;
+"""
+_REMOVE_BOOK = """
+    UPDATE category_stats SET
+        count = count - 1,
+        price_count = price_count - (OLD.price IS NOT NULL),
+        price_sum = price_sum - COALESCE(OLD.price, 0),
+        price_sumsq = price_sumsq - COALESCE(OLD.price * OLD.price, 0),
+        min_price = CASE WHEN OLD.price <= min_price THEN (
+            SELECT MIN(price) FROM books WHERE category IS OLD.category
+        ) ELSE min_price END,
+        max_price = CASE WHEN OLD.price >= max_price THEN (
+            SELECT MAX(price) FROM books WHERE category IS OLD.category
+        ) ELSE max_price END
+    WHERE category = COALESCE(OLD.category, '');
+    DELETE FROM category_stats WHERE category = COALESCE(OLD.category, '') AND count <= 0;
+    UPDATE rating_stats SET count = count - 1 WHERE rating = COALESCE(OLD.rating, 0);
+    DELETE FROM rating_stats WHERE rating = COALESCE(OLD.rating, 0) AND count <= 0;
+"""
+
+# Uniform sample of the catalog for approximate stats: every sampled book
+# draws a random priority in [0, 1) and the sample holds exactly the books
+# whose priority is below ``threshold``. An insert joins the sample when its
+# priority is below the threshold; once the sample exceeds ``size``, the
+# threshold drops to the highest priority, which leaves the sample. Deletes
+# only remove books, so the sample stays uniform; ``ensure_aggregates_in``
+# draws it again once it has shrunk to half its size.
+BOOK_SAMPLE_DDL = """
+    CREATE TABLE IF NOT EXISTS book_sample (
+        book_id INTEGER PRIMARY KEY,
+        priority REAL NOT NULL
+    )
+"""
+BOOK_SAMPLE_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_book_sample_priority ON book_sample (priority)
+"""
+SAMPLE_META_DDL = """
+    CREATE TABLE IF NOT EXISTS sample_meta (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        size INTEGER NOT NULL,
+        threshold REAL NOT NULL,
+        sampled INTEGER NOT NULL,
+        population INTEGER NOT NULL
+    )
+"""
+_SAMPLE_ADD_BOOK = """
+    UPDATE sample_meta SET population = population + 1;
+    INSERT INTO book_sample (book_id, priority)
+    VALUES (NEW.id, random() / 18446744073709551616.0 + 0.5);
+    DELETE FROM book_sample
+    WHERE book_id = NEW.id AND priority >= (SELECT threshold FROM sample_meta);
+    UPDATE sample_meta
+    SET sampled = sampled + (SELECT COUNT(*) FROM book_sample WHERE book_id = NEW.id);
+    UPDATE sample_meta
+    SET threshold = (SELECT MAX(priority) FROM book_sample), sampled = sampled - 1
+    WHERE sampled > size;
+    DELETE FROM book_sample WHERE priority >= (SELECT threshold FROM sample_meta);
+"""
+_SAMPLE_REMOVE_BOOK = """
+    UPDATE sample_meta SET
+        population = population - 1,
+        sampled = sampled - (SELECT COUNT(*) FROM book_sample WHERE book_id = OLD.id);
+    DELETE FROM book_sample WHERE book_id = OLD.id;
+"""
+SAMPLE_TRIGGERS_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_sample_insert AFTER INSERT ON books
+    BEGIN {_SAMPLE_ADD_BOOK} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_sample_delete AFTER DELETE ON books
+    BEGIN {_SAMPLE_REMOVE_BOOK} END
+    """,
+]
+
+AGGREGATE_TRIGGERS_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_aggregates_insert AFTER INSERT ON books
+    BEGIN {_ADD_BOOK} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_aggregates_delete AFTER DELETE ON books
+    BEGIN {_REMOVE_BOOK} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_aggregates_update
+    AFTER UPDATE OF category, price, rating ON books
+    BEGIN {_REMOVE_BOOK} {_ADD_BOOK} END
+    """,
+]
+
+
+def rebuild_aggregates(conn: sqlite3.Connection) -> None:
+    """
+    Recompute the aggregate tables from a full scan of the books table.
+    Only needed once, when the tables are created for an existing catalog;
+    afterwards the triggers keep them up to date.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+    """
+    conn.execute("DELETE FROM category_stats")
+    conn.execute("DELETE FROM rating_stats")
+    conn.execute(
+        """
+        INSERT INTO category_stats
+            (category, count, price_count, price_sum, price_sumsq, min_price, max_price)
+        SELECT COALESCE(category, ''), COUNT(*), COUNT(price), COALESCE(SUM(price), 0),
+               COALESCE(SUM(price * price), 0), MIN(price), MAX(price)
+        FROM books
+        GROUP BY COALESCE(category, '')
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO rating_stats (rating, count)
+        SELECT COALESCE(rating, 0), COUNT(*) FROM books GROUP BY COALESCE(rating, 0)
+        """
+    )
+
+
+def rebuild_sample(conn: sqlite3.Connection, size: int) -> None:
+    """
+    Draw a new uniform sample of ``size`` books from a full scan of the books
+    table. Needed when the sample is created or resized, or after deletes
+    have shrunk it; afterwards the triggers keep it up to date.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+        size: Number of books to sample.
+    """
+    ids = [row[0] for row in conn.execute("SELECT id FROM books")]
+    draws = sorted((random.random(), book_id) for book_id in ids)
+    threshold = draws[size][0] if len(draws) > size else 1.0
+    conn.execute("DELETE FROM book_sample")
+    conn.executemany(
+        "INSERT INTO book_sample (book_id, priority) VALUES (?, ?)",
+        [(book_id, priority) for priority, book_id in draws[:size]],
+    )
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO sample_meta (id, size, threshold, sampled, population)
+        VALUES (1, ?, ?, ?, ?)
+        """,
+        (size, threshold, min(size, len(draws)), len(draws)),
+    )
+
+
+def ensure_sample_in(conn: sqlite3.Connection, size: Optional[int] = None) -> bool:
+    """
+    Create the book sample and its triggers on an open connection, drawing
+    it again when it is new, when ``size`` differs from its current size or
+    when deletes have left it with less than half its size.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+        size: Wanted sample size; None keeps the current one.
+
+    Returns:
+        True if the sample had to be drawn.
+    """
+    conn.execute(BOOK_SAMPLE_DDL)
+    conn.execute(BOOK_SAMPLE_INDEX_DDL)
+    conn.execute(SAMPLE_META_DDL)
+    for ddl in SAMPLE_TRIGGERS_DDL:
+        conn.execute(ddl)
+    meta = conn.execute("SELECT size, sampled, population FROM sample_meta").fetchone()
+    if meta is None:
+        rebuild_sample(conn, size or DEFAULT_SAMPLE_SIZE)
+        return True
+    current, sampled, population = meta
+    if (size is not None and size != current) or (sampled < current // 2 and sampled < population):
+        rebuild_sample(conn, size or current)
+        return True
+    return False
+
+
+def ensure_aggregates_in(conn: sqlite3.Connection, sample_size: Optional[int] = None) -> bool:
+    """
+    Create the aggregate tables, the book sample and their triggers on an
+    open connection, filling the tables from the books table the first time.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+        sample_size: Wanted book sample size; None keeps the current one.
+
+    Returns:
+        True if the aggregate tables had to be created and filled.
+    """
+    created = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+        "AND name IN ('category_stats', 'rating_stats')"
+    ).fetchone()[0] < 2
+    conn.execute(CATEGORY_STATS_DDL)
+    conn.execute(RATING_STATS_DDL)
+    conn.execute(BOOKS_CATEGORY_INDEX_DDL)
+    for ddl in AGGREGATE_TRIGGERS_DDL:
+        conn.execute(ddl)
+    if created:
+        rebuild_aggregates(conn)
+    ensure_sample_in(conn, sample_size)
+    return created
+
+
+def ensure_aggregates(manager: DatabaseManager, sample_size: Optional[int] = None) -> bool:
+    """
+    Make sure the aggregate tables and the book sample exist and are
+    maintained by triggers.
+
+    Args:
+        manager: Database holding the catalog.
+        sample_size: Wanted book sample size; None keeps the current one.
+
+    Returns:
+        True if the aggregate tables had to be created and filled.
+    """
+    with manager.transaction() as conn:
+        return ensure_aggregates_in(conn, sample_size)
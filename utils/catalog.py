@@ -0,0 +1,368 @@
+from utils.database_manager import DatabaseManager, DatabaseError
+from utils.aggregates import ensure_aggregates_in
+from typing import Any, Dict, List
+from datetime import datetime
+from threading import Lock
+import sqlite3
+
+BOOK_FIELDS = [
+    "title",
+    "price",
+    "rating",
+    "availability",
+    "category",
+    "description",
+    "image_url",
+    "book_url",
+    "page_number",
+    "scraped_at",
+]
+TRACKED_FIELDS = [field for field in BOOK_FIELDS if field != "scraped_at"]
+HISTORY_FIELDS = ["price", "availability", "rating"]
+
+CATALOG_META_DDL = """
+    CREATE TABLE IF NOT EXISTS catalog_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+"""
+BOOK_CHANGES_DDL = """
+    CREATE TABLE IF NOT EXISTS book_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        version INTEGER NOT NULL,
+        book_id INTEGER NOT NULL,
+        operation TEXT NOT NULL CHECK (operation IN ('insert', 'update', 'delete')),
+        changed_at TEXT NOT NULL
+    )
+"""
+BOOK_CHANGES_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_book_changes_version ON book_changes (version)
+"""
+BOOK_PRICE_HISTORY_DDL = """
+    CREATE TABLE IF NOT EXISTS book_price_history (
+        book_url TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        price REAL,
+        availability TEXT,
+        rating INTEGER,
+        recorded_at TEXT,
+        PRIMARY KEY (book_url, version)
+    ) WITHOUT ROWID
+"""
+
+
+def get_catalog_version(manager: DatabaseManager) -> int:
+    """
+    Read the current catalog version.
+    The version is a counter bumped every time a scrape changes the books
+    table, so anything derived from the catalog can be keyed on it.
+
+    Args:
+        manager: Database holding the catalog.
+
+    Returns:
+        The catalog version, or 0 if the catalog has never been versioned.
+    """
+    try:
+        rows = manager.select("SELECT value FROM catalog_meta WHERE key = 'version'")
+    except DatabaseError:
+        return 0
+    return rows[0]["value"] if rows else 0
+
+
+def get_catalog_version_in(conn: sqlite3.Connection) -> int:
+    """
+    Read the current catalog version on an open connection.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+
+    Returns:
+        The catalog version, or 0 if the catalog has never been versioned.
+    """
+    conn.execute(CATALOG_META_DDL)
+    row = conn.execute("SELECT value FROM catalog_meta WHERE key = 'version'").fetchone()
+    return row[0] if row else 0
+
+
+def bump_catalog_version(conn: sqlite3.Connection) -> int:
+    """
+    Increment the catalog version inside an open transaction.
+    Call it in the same transaction that changes the books table so readers
+    never see new rows under an old version.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+
+    Returns:
+        The new catalog version.
+    """
+    conn.execute(CATALOG_META_DDL)
+    conn.execute(
+        """
+        INSERT INTO catalog_meta (key, value) VALUES ('version', 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1
+        """
+    )
+    return conn.execute(
+        "SELECT value FROM catalog_meta WHERE key = 'version'"
+    ).fetchone()[0]
+
+
+def ensure_change_log_in(conn: sqlite3.Connection) -> int:
+    """
+    Create the change log on an open connection and return the oldest
+    version it can serve deltas from. Clients synchronised to an older
+    version have to reload the catalog instead.
+    The start is recorded in ``catalog_meta`` the first time. It is the
+    version before the oldest logged change, or the current version for an
+    empty log. Books present at version 0 but never logged as inserted (a
+    catalog loaded before versioning) move the start to version 1, bumping
+    the catalog version if needed, so a client with no books at all
+    (``since=0``) is told to resync rather than sent an empty delta.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+
+    Returns:
+        The oldest catalog version the change log covers.
+    """
+    conn.execute(CATALOG_META_DDL)
+    conn.execute(BOOK_CHANGES_DDL)
+    conn.execute(BOOK_CHANGES_INDEX_DDL)
+    row = conn.execute(
+        "SELECT value FROM catalog_meta WHERE key = 'change_log_start'"
+    ).fetchone()
+    if row:
+        return row[0]
+
+    oldest = conn.execute("SELECT MIN(version) FROM book_changes").fetchone()[0]
+    start = oldest - 1 if oldest is not None else get_catalog_version_in(conn)
+    if start == 0 and conn.execute(
+        """
+        SELECT EXISTS (
+            SELECT 1 FROM books
+            WHERE id NOT IN (SELECT book_id FROM book_changes WHERE operation = 'insert')
+        )
+        """
+    ).fetchone()[0]:
+        start = 1
+        if get_catalog_version_in(conn) == 0:
+            bump_catalog_version(conn)
+    conn.execute(
+        "INSERT INTO catalog_meta (key, value) VALUES ('change_log_start', ?)", (start,)
+    )
+    return start
+
+
+def ensure_change_log(manager: DatabaseManager) -> int:
+    """
+    Make sure the change log exists.
+
+    Args:
+        manager: Database holding the catalog.
+
+    Returns:
+        The oldest catalog version the change log covers.
+    """
+    with manager.transaction() as conn:
+        return ensure_change_log_in(conn)
+
+
+def ensure_price_history_in(conn: sqlite3.Connection) -> bool:
+    """
+    Create the price history table on an open connection. Whenever the table
+    is empty, every current book is recorded under the current catalog
+    version, so later scrapes only have to append changes.
+
+    Args:
+        conn: Connection from ``DatabaseManager.transaction``.
+
+    Returns:
+        True if the table was empty and has been seeded.
+    """
+    conn.execute(BOOK_PRICE_HISTORY_DDL)
+    cursor = conn.execute(
+        """
+        INSERT INTO book_price_history
+            (book_url, version, price, availability, rating, recorded_at)
+        SELECT book_url, ?, price, availability, rating, scraped_at
+        FROM books
+        WHERE id IN (
+            SELECT MIN(id) FROM books WHERE book_url IS NOT NULL GROUP BY book_url
+        )
+        AND NOT EXISTS (SELECT 1 FROM book_price_history)
+        """,
+        (get_catalog_version_in(conn),),
+    )
+    return cursor.rowcount > 0
+
+
+def ensure_price_history(manager: DatabaseManager) -> bool:
+    """
+    Make sure the price history table exists.
+
+    Args:
+        manager: Database holding the catalog.
+
+    Returns:
+        True if the table was empty and has been seeded.
+    """
+    with manager.transaction() as conn:
+        return ensure_price_history_in(conn)
+
+
+class CatalogVersionWatcher:
+    """
+    Tracks the catalog version cheaply through a long-lived read connection.
+    ``PRAGMA data_version`` only changes when another connection commits, so
+    the catalog_meta row is re-read only after a write, not on every check.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the watcher.
+
+        Args:
+            db_path: Path to the SQLite database holding the catalog.
+        """
+        self.db_path = db_path
+        self._conn = None
+        self._data_version = None
+        self._version = 0
+        self._lock = Lock()
+
+    def current(self) -> int:
+        """
+        Return the current catalog version.
+        If the database cannot be read, the last known version is returned.
+
+        Returns:
+            The catalog version, or 0 if the catalog has never been versioned.
+        """
+        with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = sqlite3.connect(
+                        self.db_path, timeout=30.0, check_same_thread=False
+                    )
+                data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    try:
+                        row = self._conn.execute(
+                            "SELECT value FROM catalog_meta WHERE key = 'version'"
+                        ).fetchone()
+                    except sqlite3.OperationalError:
+                        row = None
+                    self._version = row[0] if row else 0
+                    self._data_version = data_version
+            except sqlite3.Error:
+                self._conn = None
+            return self._version
+
+
+def sync_books(
+    manager: DatabaseManager, books: List[Dict[str, Any]], complete: bool = False
+) -> Dict[str, int]:
+    """
+    Make the books table match a fresh scrape, keyed by ``book_url``.
+    New books are inserted and books whose tracked fields changed are updated
+    in place (keeping their ID). Books missing from the scrape are deleted
+    only when ``complete`` is set, since a failed page would otherwise drop
+    its books and give them new IDs when they come back; duplicate rows of
+    the same URL are always removed. When anything changed, the catalog version is bumped and every
+    change is written to ``book_changes`` under the new version, all in a
+    single transaction. The stats aggregate tables are kept in step by
+    their triggers. Only new books and books whose price, availability or
+    rating changed get a row in ``book_price_history``, so the history
+    stores deltas rather than full snapshots.
+
+    Args:
+        manager: Database holding the catalog.
+        books: Scraped books, as dictionaries with the BOOK_FIELDS keys.
+        complete: Whether the scrape covered the whole site, so books it
+            did not find are gone.
+
+    Returns:
+        The resulting catalog version and the number of inserted, updated
+        and deleted books.
+    """
+    scraped = {book["book_url"]: book for book in books}
+    columns = ", ".join(BOOK_FIELDS)
+    placeholders = ", ".join("?" for _ in BOOK_FIELDS)
+    assignments = ", ".join(f"{field} = ?" for field in BOOK_FIELDS)
+
+    with manager.transaction() as conn:
+        ensure_aggregates_in(conn)
+        ensure_price_history_in(conn)
+        ensure_change_log_in(conn)
+        existing = {}
+        stale_ids = []
+        for row in conn.execute(f"SELECT id, {columns} FROM books ORDER BY id"):
+            if row["book_url"] in existing:
+                stale_ids.append(row["id"])
+            else:
+                existing[row["book_url"]] = row
+
+        changes = []
+        history = []
+        for book_url, book in scraped.items():
+            values = tuple(book[field] for field in BOOK_FIELDS)
+            current = existing.pop(book_url, None)
+            if current is None:
+                cursor = conn.execute(
+                    f"INSERT INTO books ({columns}) VALUES ({placeholders})", values
+                )
+                changes.append((cursor.lastrowid, "insert"))
+                history.append(book)
+            elif any(current[field] != book[field] for field in TRACKED_FIELDS):
+                conn.execute(
+                    f"UPDATE books SET {assignments} WHERE id = ?",
+                    values + (current["id"],),
+                )
+                changes.append((current["id"], "update"))
+                if any(current[field] != book[field] for field in HISTORY_FIELDS):
+                    history.append(book)
+
+        if complete:
+            stale_ids += [row["id"] for row in existing.values()]
+        conn.executemany("DELETE FROM books WHERE id = ?", [(i,) for i in stale_ids])
+        changes += [(book_id, "delete") for book_id in stale_ids]
+
+        version = get_catalog_version_in(conn)
+        if changes:
+            version = bump_catalog_version(conn)
+            changed_at = datetime.now().isoformat()
+            conn.executemany(
+                """
+                INSERT INTO book_changes (version, book_id, operation, changed_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(version, book_id, op, changed_at) for book_id, op in changes],
+            )
+            conn.executemany(
+                """
+                INSERT INTO book_price_history
+                    (book_url, version, price, availability, rating, recorded_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        book["book_url"],
+                        version,
+                        book["price"],
+                        book["availability"],
+                        book["rating"],
+                        book["scraped_at"] or changed_at,
+                    )
+                    for book in history
+                ],
+            )
+
+    operations = [op for _, op in changes]
+    return {
+        "version": version,
+        "inserted": operations.count("insert"),
+        "updated": operations.count("update"),
+        "deleted": operations.count("delete"),
+    }
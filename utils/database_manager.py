@@ -1,4 +1,5 @@
-from typing import Any, List, Optional, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
 from pathlib import Path
 import sqlite3
 
@@ -219,6 +220,34 @@ class DatabaseManager:
         cursor = self._execute(query, values)
         return cursor.rowcount
 
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection whose statements run inside a single transaction.
+
+        The transaction is committed when the block exits normally and rolled
+        back if it raises, so multi-statement writes are applied atomically.
+
+        Yields:
+            sqlite3.Connection: Open connection using ``sqlite3.Row`` rows.
+
+        Raises:
+            DatabaseError: If any statement inside the block fails.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except DatabaseError:
+            conn.rollback()
+            raise
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise DatabaseError(f"Transaction failed: {e}") from e
+        finally:
+            conn.close()
+
     def table_exists(self, table_name: str) -> bool:
         """
         Check if a table exists in the database.
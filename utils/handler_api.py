@@ -205,6 +205,75 @@ class APIHandler:
         book_id = randint(1, 1000)
         return self._auth_get(f"/api/v1/books/{book_id}", token)
 
+    def test_books_changes(self, token: str, since: int = 0) -> tuple[dict | None, bool, dict | None]:
+        """
+        Get the books changed since a catalog version.
+        Args:
+            token (str): The access token for authentication.
+            since (int): The catalog version to sync from.
+        Returns:
+            tuple: A tuple containing the JSON data, status (bool), and payload.
+        """
+        return self._auth_get("/api/v1/books/changes", token, params={"since": since})
+
+    def test_book_similar(self, token: str) -> tuple[dict | None, bool, dict | None]:
+        """
+        Get the books most similar to a random book.
+        Args:
+            token (str): The access token for authentication.
+        Returns:
+            tuple: A tuple containing the JSON data, status (bool), and payload.
+        """
+        book_id = randint(1, 1000)
+        params = {"limit": randint(1, 10)}
+        return self._auth_get(f"/api/v1/books/{book_id}/similar", token, params=params)
+
+    def test_book_history(self, token: str) -> tuple[dict | None, bool, dict | None]:
+        """
+        Get the price history of a random book.
+        Args:
+            token (str): The access token for authentication.
+        Returns:
+            tuple: A tuple containing the JSON data, status (bool), and payload.
+        """
+        book_id = randint(1, 1000)
+        return self._auth_get(f"/api/v1/books/{book_id}/history", token)
+
+    def test_books_export(self, token: str, export_format: str) -> tuple[dict | None, bool, dict | None]:
+        """
+        Download the catalog export in a given format.
+        Args:
+            token (str): The access token for authentication.
+            export_format (str): One of "parquet", "arrow" or "csv".
+        Returns:
+            tuple: A tuple containing the JSON data (None, the export is a
+            file), status (bool), and payload.
+        """
+        return self._auth_get("/api/v1/books/export", token, params={"format": export_format})
+
+    def test_books_negotiated(self, token: str, media_type: str) -> tuple[dict | None, bool, dict | None]:
+        """
+        Get all books asking for a non-JSON media type through the Accept header.
+        The request only succeeds if the response uses that media type.
+        Args:
+            token (str): The access token for authentication.
+            media_type (str): The media type to ask for.
+        Returns:
+            tuple: A tuple containing None, status (bool), and the Accept header sent.
+        """
+        url = f"{self.base_url}/api/v1/books/"
+        payload = {"accept": media_type}
+        headers = {**self._auth_header(token), "Accept": media_type}
+        try:
+            response = request("GET", url, headers=headers, timeout=10)
+            response.raise_for_status()
+        except exceptions.RequestException as e:
+            logger.error(f"[RequestException] {url} - {e}")
+            return None, False, payload
+        content_type = response.headers.get("content-type", "")
+        logger.info(f"[GET] {url} - {response.status_code} - {content_type}")
+        return None, content_type.startswith(media_type), payload
+
     def test_categories(self, token: str) -> tuple[dict | None, bool, dict | None]:
         """
         Get all book categories from the API.
@@ -235,6 +304,34 @@ class APIHandler:
         """         
         return self._auth_get("/api/v1/stats/categories", token)
 
+    def test_stats_prices(self, token: str) -> tuple[dict | None, bool, dict | None]:
+        """
+        Get the price distribution, exactly or from the sample.
+        Args:
+            token (str): The access token for authentication.
+        Returns:
+            tuple: A tuple containing the JSON data, status (bool), and payload.
+        """
+        params = {"bins": randint(1, 20), "percentiles": "5,50,95", "approx": bool(randint(0, 1))}
+        return self._auth_get("/api/v1/stats/prices", token, params=params)
+
+    def test_stats_crosstab(self, token: str) -> tuple[dict | None, bool, dict | None]:
+        """
+        Get a cross-tab of two book attributes, exactly or from the sample.
+        Args:
+            token (str): The access token for authentication.
+        Returns:
+            tuple: A tuple containing the JSON data, status (bool), and payload.
+        """
+        rows, cols = choice([("category", "rating"), ("rating", "availability"), ("availability", "category")])
+        params = {
+            "rows": rows,
+            "cols": cols,
+            "metric": choice(["count", "avg_price"]),
+            "approx": bool(randint(0, 1)),
+        }
+        return self._auth_get("/api/v1/stats/crosstab", token, params=params)
+
     def test_ml_features(self, token: str) -> tuple[dict | None, bool, dict | None]:
         """
         Get all book categories from the API.
@@ -0,0 +1,236 @@
+from logging import getLogger, basicConfig, INFO
+from scipy.sparse import csr_matrix, diags
+from pathlib import Path
+from re import findall
+import numpy as np
+import sys
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DB_PATH = ROOT_DIR / "tmp" / "bookonthetable.db"
+sys.path.append(str(ROOT_DIR))
+
+from utils.database_manager import DatabaseManager
+from utils.catalog import bump_catalog_version
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+logger = getLogger(__name__)
+basicConfig(level=INFO, format=FORMAT)
+
+TOP_K = 10
+BLOCK_SIZE = 512
+TITLE_REPEAT = 2
+MIN_DF = 2
+MAX_DF = 0.5
+
+TEXT_WEIGHT = 0.7
+CATEGORY_WEIGHT = 0.2
+PRICE_WEIGHT = 0.1
+PRICE_SCALE = 0.5
+
+TOKEN_PATTERN = r"[a-z0-9]{2,}"
+STOP_WORDS = frozenset(
+    """
+    a about after again all also an and any are as at be because been before
+    being between both but by can could did do does doing down during each few
+    for from further had has have having he her here hers herself him himself
+    his how i if in into is it its itself just me more most my myself no nor
+    not now of off on once only or other our ours ourselves out over own same
+    she should so some such than that the their theirs them themselves then
+    there these they this those through to too under until up very was we were
+    what when where which while who whom why will with would you your yours
+    yourself yourselves more one two new book books
+    """.split()
+)
+
+SIMILARITY_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS book_similarities (
+        book_id INTEGER NOT NULL,
+        rank INTEGER NOT NULL,
+        similar_id INTEGER NOT NULL,
+        score REAL NOT NULL,
+        PRIMARY KEY (book_id, rank)
+    ) WITHOUT ROWID
+"""
+
+
+def _tokenize(text: str) -> list:
+    """
+    Split a text into lowercase alphanumeric tokens, dropping stop words.
+    Args:
+        text (str): Raw text to tokenize.
+    Returns:
+        list: The tokens found in the text.
+    """
+    return [
+        token
+        for token in findall(TOKEN_PATTERN, (text or "").lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def build_tfidf_matrix(
+    documents: list, min_df: int = MIN_DF, max_df: float = MAX_DF
+) -> csr_matrix:
+    """
+    Build an L2-normalised TF-IDF matrix for a list of documents.
+    Uses sublinear term frequency and smoothed inverse document frequency.
+    Terms seen in fewer than ``min_df`` documents or in more than ``max_df``
+    of them are dropped.
+    Args:
+        documents (list): The documents to vectorize.
+        min_df (int): Minimum document frequency of a kept term.
+        max_df (float): Maximum document frequency of a kept term, as a ratio.
+    Returns:
+        csr_matrix: A sparse matrix with one row per document.
+    """
+    vocabulary = {}
+    indices = []
+    indptr = [0]
+    for document in documents:
+        for token in _tokenize(document):
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+        indptr.append(len(indices))
+
+    total = len(documents)
+    counts = csr_matrix(
+        (np.ones(len(indices), dtype=np.float64), indices, indptr),
+        shape=(total, len(vocabulary)),
+    )
+    counts.sum_duplicates()
+
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    kept = np.flatnonzero(
+        (document_frequency >= min_df) & (document_frequency <= max_df * total)
+    )
+    counts = counts[:, kept].tocsr()
+    document_frequency = document_frequency[kept]
+
+    idf = np.log((1 + total) / (1 + document_frequency)) + 1.0
+    counts.data = 1.0 + np.log(counts.data)
+    tfidf = (counts @ diags(idf)).tocsr()
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return (diags(1.0 / norms) @ tfidf).tocsr()
+
+
+def _top_k_neighbours(
+    tfidf: csr_matrix,
+    category_codes: np.ndarray,
+    log_prices: np.ndarray,
+    top_k: int,
+    block_size: int = BLOCK_SIZE,
+) -> tuple:
+    """
+    Compute the ``top_k`` most similar books for every book.
+    The score blends text cosine similarity, a same-category bonus and a
+    price affinity that decays with the distance between log prices.
+    Rows are processed in blocks so memory stays O(block_size * N).
+    Args:
+        tfidf (csr_matrix): L2-normalised TF-IDF rows, one per book.
+        category_codes (np.ndarray): Integer category code per book.
+        log_prices (np.ndarray): ``log1p`` of the price per book.
+        top_k (int): Number of neighbours to keep per book.
+        block_size (int): Number of rows scored at once.
+    Returns:
+        tuple: Arrays ``(neighbours, scores)`` of shape (N, top_k), ordered
+        by descending score.
+    """
+    total = tfidf.shape[0]
+    neighbours = np.empty((total, top_k), dtype=np.int64)
+    scores = np.empty((total, top_k), dtype=np.float64)
+    tfidf_t = tfidf.T.tocsr()
+
+    for start in range(0, total, block_size):
+        stop = min(start + block_size, total)
+        block = (tfidf[start:stop] @ tfidf_t).toarray() * TEXT_WEIGHT
+        block += CATEGORY_WEIGHT * (
+            category_codes[start:stop, None] == category_codes[None, :]
+        )
+        block += PRICE_WEIGHT * np.exp(
+            -np.abs(log_prices[start:stop, None] - log_prices[None, :]) / PRICE_SCALE
+        )
+        rows = np.arange(stop - start)
+        block[rows, rows + start] = -np.inf
+
+        candidates = np.argpartition(-block, top_k - 1, axis=1)[:, :top_k]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        neighbours[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+
+    return neighbours, scores
+
+
+def build_similarity_index(manager: DatabaseManager, top_k: int = TOP_K) -> int:
+    """
+    Precompute the nearest neighbours of every book and store them in the
+    ``book_similarities`` table, replacing any previous index atomically.
+    When the stored neighbours change, the catalog version is bumped in the
+    same transaction, so neighbours cached while the previous index was live
+    are never served again; an identical rebuild leaves the table and the
+    version, and so every catalog cache, untouched.
+    Args:
+        manager (DatabaseManager): Database holding the ``books`` table.
+        top_k (int): Number of neighbours stored per book.
+    Returns:
+        int: Number of neighbour rows written.
+    """
+    logger.info("Building book similarity index.")
+    books = manager.select(
+        "SELECT id, title, description, category, price FROM books ORDER BY id"
+    )
+    top_k = min(top_k, len(books) - 1)
+
+    values = []
+    if top_k > 0:
+        ids = np.array([book["id"] for book in books], dtype=np.int64)
+        tfidf = build_tfidf_matrix(
+            [
+                " ".join([book["title"] or ""] * TITLE_REPEAT + [book["description"] or ""])
+                for book in books
+            ]
+        )
+        _, category_codes = np.unique(
+            [(book["category"] or "").strip().lower() for book in books],
+            return_inverse=True,
+        )
+        log_prices = np.log1p(
+            np.array([book["price"] or 0.0 for book in books], dtype=np.float64)
+        )
+        neighbours, scores = _top_k_neighbours(tfidf, category_codes, log_prices, top_k)
+        values = [
+            (int(ids[row]), rank, int(ids[neighbour]), float(score))
+            for row in range(len(ids))
+            for rank, (neighbour, score) in enumerate(
+                zip(neighbours[row], scores[row]), start=1
+            )
+        ]
+
+    with manager.transaction() as conn:
+        conn.execute(SIMILARITY_TABLE_DDL)
+        stored = conn.execute(
+            """
+            SELECT book_id, rank, similar_id, score FROM book_similarities
+            ORDER BY book_id, rank
+            """
+        ).fetchall()
+        if [tuple(row) for row in stored] == values:
+            logger.info("Similarity index unchanged.")
+            return len(values)
+        conn.execute("DELETE FROM book_similarities")
+        conn.executemany(
+            """
+            INSERT INTO book_similarities (book_id, rank, similar_id, score)
+            VALUES (?, ?, ?, ?)
+            """,
+            values,
+        )
+        bump_catalog_version(conn)
+
+    logger.info(f"Similarity index built with {len(values)} neighbour rows.")
+    return len(values)
+
+
+if __name__ == "__main__":
+    build_similarity_index(DatabaseManager(str(DB_PATH)))